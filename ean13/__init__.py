@@ -0,0 +1,11 @@
+# Спільне ядро EAN-13 без GUI та БД: таблиці, кодер, рендер і декодер.
+# Tk-застосунки (lab2, lab3, lab4, manualcreate) імпортують його звідси.
+
+from .tables import L_CODES, G_CODES, R_CODES, PARITY_PATTERNS
+from .encoder import EAN13ManualGenerator, calculate_check_digit
+from .decoder import EAN13ManualDecoder
+
+__all__ = [
+    "L_CODES", "G_CODES", "R_CODES", "PARITY_PATTERNS",
+    "EAN13ManualGenerator", "EAN13ManualDecoder", "calculate_check_digit",
+]
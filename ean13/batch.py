@@ -0,0 +1,79 @@
+# Векторизоване кодування великих партій кодів (каталоги на сотні тисяч SKU).
+# Весь розрахунок — індексація NumPy-таблиць, без циклу по цифрах.
+
+import numpy as np
+
+from .tables import L_CODES, G_CODES, R_CODES, PARITY_PATTERNS, START_GUARD, CENTER_GUARD, END_GUARD, MODULES
+
+
+def _bits(codes):
+    return np.array([[int(b) for b in code] for code in codes], dtype=np.uint8)
+
+
+# SYMBOL_BITS[набір, цифра] -> 7 модулів; набір 0 = L, 1 = G, 2 = R
+SYMBOL_BITS = np.stack([_bits(L_CODES), _bits(G_CODES), _bits(R_CODES)])
+# PARITY_SETS[перша цифра, позиція] -> 0 (L) або 1 (G)
+PARITY_SETS = np.array([[0 if p == 'L' else 1 for p in pattern] for pattern in PARITY_PATTERNS], dtype=np.intp)
+CHECK_WEIGHTS = np.array([1, 3] * 6, dtype=np.int64)
+
+_START = _bits([START_GUARD])[0]
+_CENTER = _bits([CENTER_GUARD])[0]
+_END = _bits([END_GUARD])[0]
+
+
+def to_digit_matrix(codes, length=12):
+    arr = np.asarray(codes)
+    if arr.size == 0:
+        return np.empty((0, length), dtype=np.int64)
+    if arr.ndim == 2 and arr.dtype.kind in 'iu':
+        if arr.shape[1] != length:
+            raise ValueError(f"Кожен код має містити рівно {length} цифр!")
+        digits = arr.astype(np.int64)
+    elif arr.ndim == 1 and arr.dtype.kind in 'iu':
+        if (arr.min() < 0 or arr.max() >= 10 ** length):
+            raise ValueError(f"Кожен код має містити рівно {length} цифр!")
+        powers = 10 ** np.arange(length - 1, -1, -1, dtype=np.int64)
+        digits = (arr.astype(np.int64)[:, None] // powers) % 10
+    elif arr.ndim == 1 and arr.dtype.kind in 'US':
+        if np.any(np.char.str_len(arr) != length):
+            raise ValueError(f"Кожен код має містити рівно {length} цифр!")
+        digits = arr.astype(f'S{length}').view(np.uint8).reshape(-1, length).astype(np.int64) - ord('0')
+    else:
+        raise TypeError("Очікується список рядків, масив цілих або матриця N×12 цифр")
+
+    if np.any((digits < 0) | (digits > 9)):
+        raise ValueError(f"Кожен код має містити рівно {length} цифр!")
+    return digits
+
+
+def check_digits_many(digits):
+    total = digits[:, :12] @ CHECK_WEIGHTS
+    return ((10 - total % 10) % 10).astype(np.uint8)
+
+
+def encode_many(codes, packed=False):
+    digits = to_digit_matrix(codes)
+    n = len(digits)
+    checks = check_digits_many(digits)
+
+    left_sets = PARITY_SETS[digits[:, 0]]
+    left = SYMBOL_BITS[left_sets, digits[:, 1:7]]
+    right_digits = np.concatenate([digits[:, 7:12], checks[:, None].astype(np.int64)], axis=1)
+    right = SYMBOL_BITS[2, right_digits]
+
+    modules = np.empty((n, MODULES), dtype=np.uint8)
+    modules[:, 0:3] = _START
+    modules[:, 3:45] = left.reshape(n, 42)
+    modules[:, 45:50] = _CENTER
+    modules[:, 50:92] = right.reshape(n, 42)
+    modules[:, 92:95] = _END
+
+    if packed:
+        modules = np.packbits(modules, axis=1)
+    return checks, modules
+
+
+def full_codes_many(codes):
+    digits = to_digit_matrix(codes)
+    full = np.concatenate([digits, check_digits_many(digits)[:, None]], axis=1).astype(np.uint8) + ord('0')
+    return full.view('S13').ravel().astype(str)
@@ -0,0 +1,160 @@
+# Контентно-адресований дисковий кеш відрендерених етикеток.
+# Ключ — хеш коду та всіх параметрів рендеру; запис атомарний (тимчасовий файл + os.replace),
+# витіснення — LRU за mtime у межах заданого бюджету байтів.
+
+import hashlib
+import inspect
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .encoder import EAN13ManualGenerator
+from .render import render_image, save_png
+from .vector import svg_document, write_pdf, zpl_label
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Функції, чиї типові параметри входять у ключ: виклик із типовими значеннями
+# і з тими самими значеннями, переданими явно, має давати один запис
+_RENDERERS = {"png": render_image, "svg": svg_document, "pdf": write_pdf, "zpl": zpl_label}
+
+
+def _render_defaults(fmt):
+    renderer = _RENDERERS.get(fmt)
+    if renderer is None:
+        return {}
+    return {name: param.default for name, param in inspect.signature(renderer).parameters.items()
+            if param.default is not inspect.Parameter.empty}
+
+
+class RenderCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, generator=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.generator = generator or EAN13ManualGenerator()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # шлях -> розмір, від найстарішого до найсвіжішого
+        self._bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, path, st.st_size))
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._bytes += size
+
+    def key(self, code, fmt="png", **options):
+        payload = json.dumps([code, fmt, sorted(options.items())], separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key, fmt="png"):
+        return os.path.join(self.directory, key[:2], f"{key}.{fmt}")
+
+    def get(self, key, fmt="png"):
+        path = self.path_for(key, fmt)
+        with self._lock:
+            if path not in self._entries and not os.path.exists(path):
+                self.misses += 1
+                return None
+            try:
+                os.utime(path)  # mtime = час останнього використання, переживає перезапуск
+            except OSError:
+                self._forget(path)
+                self.misses += 1
+                return None
+            if path not in self._entries:
+                size = os.path.getsize(path)
+                self._entries[path] = size
+                self._bytes += size
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return path
+
+    def put(self, key, data, fmt="png"):
+        path = self.path_for(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        with self._lock:
+            self._forget(path)
+            self._entries[path] = len(data)
+            self._bytes += len(data)
+            self._evict()
+        return path
+
+    def render(self, code, fmt="png", compression="default", **options):
+        # Повертає (шлях до файлу, повний 13-значний код); рендерить лише при промаху
+        key_options = dict(_render_defaults(fmt), **options)
+        if fmt == "png":
+            key_options["compression"] = compression
+        key = self.key(code, fmt, **key_options)
+        full_code, _ = self.generator.encode_int(code)
+        path = self.get(key, fmt)
+        if path is not None:
+            return path, full_code
+
+        if fmt == "png":
+            img, full_code = self.generator.generate_image(code, **options)
+            buf = io.BytesIO()
+            save_png(img, buf, compression)
+            data = buf.getvalue()
+        elif fmt == "pdf":
+            buf = io.BytesIO()
+            self.generator.write_vector(code, buf, fmt, **options)
+            data = buf.getvalue()
+        else:
+            buf = io.StringIO()
+            self.generator.write_vector(code, buf, fmt, **options)
+            data = buf.getvalue().encode("utf-8")
+        return self.put(key, data, fmt), full_code
+
+    def _forget(self, path):
+        size = self._entries.pop(path, None)
+        if size is not None:
+            self._bytes -= size
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            path, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
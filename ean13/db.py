@@ -0,0 +1,533 @@
+# Спільний шар доступу до таблиці products для GUI (lab4) і пакетних інструментів.
+# Пул зʼєднань замість connect/close на кожен запит, перевірка зʼєднань після простою,
+# повтор після обриву та серверні підготовлені запити (PREPARE) для вставки й пошуку за кодом.
+#
+#   python -m ean13.db import products.csv
+#   python -m ean13.decode_batch /data/scans | python -m ean13.db lookup -
+#
+# psycopg2 імпортується тут, а не в ean13/__init__, щоб ядро штрих-кодів не залежало від БД.
+
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions as pg_ext
+from psycopg2 import pool as pg_pool
+
+from .encoder import calculate_check_digit
+from .labels import _chunks, read_feed
+
+HEALTH_CHECK_INTERVAL = 30.0  # с простою, після яких зʼєднання перевіряється SELECT 1
+
+# Імʼя -> текст PREPARE; готуються на кожному новому зʼєднанні один раз
+PREPARED_STATEMENTS = {
+    "product_insert": "PREPARE product_insert (text, text) AS "
+                      "INSERT INTO products (name, ean_code) VALUES ($1, $2)",
+    "product_by_code": "PREPARE product_by_code (text) AS "
+                       "SELECT id, name, created_at FROM products WHERE ean_code = $1",
+    "products_by_codes": "PREPARE products_by_codes (text[]) AS "
+                         "SELECT ean_code, id, name, created_at FROM products WHERE ean_code = ANY($1)",
+    "product_first_page": "PREPARE product_first_page (int) AS "
+                          "SELECT id, name, ean_code, created_at FROM products ORDER BY id DESC LIMIT $1",
+    "product_page": "PREPARE product_page (bigint, int) AS "
+                    "SELECT id, name, ean_code, created_at FROM products "
+                    "WHERE id < $1 ORDER BY id DESC LIMIT $2",
+    "product_since": "PREPARE product_since (bigint, int) AS "
+                     "SELECT id, name, ean_code, created_at FROM products "
+                     "WHERE id > $1 ORDER BY id LIMIT $2",
+}
+
+_RETRYABLE = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+IMPORT_CHUNK = 5000
+PAGE_SIZE = 200
+LOOKUP_CHUNK = 10000  # кодів на один запит ANY($1) у CLI lookup
+NOTIFY_CHANNEL = "products_changed"
+
+# seq — порядок рядків у фіді: з кількох рядків з одним кодом у чанку береться перший,
+# як і при послідовних add_product
+_STAGE_TABLE = ("CREATE TEMP TABLE IF NOT EXISTS products_import "
+                "(seq bigserial, name text, ean_code text) ON COMMIT DELETE ROWS")
+_STAGE_MERGE = ("INSERT INTO products (name, ean_code) "
+                "SELECT DISTINCT ON (ean_code) name, ean_code FROM products_import "
+                "ORDER BY ean_code, seq "
+                "ON CONFLICT (ean_code) DO NOTHING")
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def normalize_code(code):
+    # 12 цифр -> дописується контрольна; 13 цифр -> перевіряється; інакше None
+    code = code.strip()
+    if not (code.isascii() and code.isdigit()):
+        return None
+    if len(code) == 12:
+        return code + str(calculate_check_digit(code))
+    if len(code) == 13 and calculate_check_digit(code) == int(code[12]):
+        return code
+    return None
+
+
+class LookupCache:
+    # LRU + TTL для пошуку товару за ean_code. "Не знайдено" теж кешується, але коротше,
+    # щоб щойно доданий на іншому робочому місці товар швидко став видимим.
+    def __init__(self, maxsize=10000, ttl=300.0, negative_ttl=10.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # код -> (час закінчення, рядок або None)
+        self._lock = threading.Lock()
+
+    def get(self, code):
+        # (True, рядок або None) при влученні, (False, None) при промаху
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[code]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(code)
+            if entry[1] is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return True, entry[1]
+
+    def put(self, code, row):
+        ttl = self.ttl if row is not None else self.negative_ttl
+        with self._lock:
+            self._entries[code] = (time.monotonic() + ttl, row)
+            self._entries.move_to_end(code)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, code):
+        with self._lock:
+            self._entries.pop(code, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_rate": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            }
+
+
+class _PooledConnection(pg_ext.connection):
+    # Стан пулу живе на самому зʼєднанні: id() закритого зʼєднання може дістатися новому
+    prepared = False
+    last_used = None
+
+
+class ProductDB:
+    # psycopg2 тримає в пулі лише minconn простоюючих зʼєднань, а кожне повернене понад
+    # minconn закриває; тож minconn — це фактичний розмір пулу, maxconn — межа одночасних.
+    def __init__(self, config, minconn=1, maxconn=5, health_check_interval=HEALTH_CHECK_INTERVAL, cache=None):
+        self.config = dict(config)
+        self.cache = cache
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.health_check_interval = health_check_interval
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool кидає PoolError при вичерпанні; семафор змушує чекати
+        self._slots = threading.BoundedSemaphore(maxconn)
+        # Час останнього обриву: після перезапуску сервера мертві всі простоюючі зʼєднання,
+        # тож ті, що повернулись у пул раніше, перевіряються незалежно від простою
+        self._broken_at = None
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = pg_pool.ThreadedConnectionPool(self.minconn, self.maxconn,
+                                                            connection_factory=_PooledConnection, **self.config)
+            return self._pool
+
+    def _checkout(self):
+        pool = self._get_pool()
+        conn = pool.getconn()
+        try:
+            while conn.closed or (self._stale(conn) and not self._alive(conn)):
+                self._discard(conn)
+                conn = pool.getconn()
+            if not conn.prepared:
+                with conn.cursor() as cur:
+                    for statement in PREPARED_STATEMENTS.values():
+                        cur.execute(statement)
+                conn.commit()
+                conn.prepared = True
+        except BaseException:
+            # Невдалий PREPARE чи перевірка — зʼєднання закривається, а не губиться поза пулом
+            self._discard(conn)
+            raise
+        return conn
+
+    def _stale(self, conn):
+        if conn.last_used is None:
+            return False
+        broken_at = self._broken_at
+        return (time.monotonic() - conn.last_used > self.health_check_interval
+                or (broken_at is not None and conn.last_used <= broken_at))
+
+    def _alive(self, conn):
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except _RETRYABLE:
+            return False
+
+    def _discard(self, conn):
+        try:
+            self._get_pool().putconn(conn, close=True)
+        except pg_pool.PoolError:
+            pass
+
+    @contextmanager
+    def connection(self):
+        # Транзакція на час блоку: commit при успіху, rollback при помилці;
+        # зʼєднання з обірваним звʼязком не повертається в пул
+        with self._slots:
+            conn = self._checkout()
+            try:
+                yield conn
+                conn.commit()
+            except _RETRYABLE:
+                self._broken_at = time.monotonic()
+                self._discard(conn)
+                raise
+            except BaseException:
+                if not conn.closed:
+                    conn.rollback()
+                conn.last_used = time.monotonic()
+                self._get_pool().putconn(conn)
+                raise
+            else:
+                conn.last_used = time.monotonic()
+                self._get_pool().putconn(conn)
+
+    def run(self, fn, retries=1):
+        # fn(cursor) у транзакції; при обриві зʼєднання — повтор на новому. Решта простоюючих
+        # зʼєднань перед повтором перевіряється в _checkout, тож мертвий пул не зʼїдає спроби
+        for attempt in range(retries + 1):
+            try:
+                with self.connection() as conn:
+                    with conn.cursor() as cur:
+                        return fn(cur)
+            except _RETRYABLE:
+                if attempt == retries:
+                    raise
+
+    def add_product(self, name, code):
+        # True — додано, False — такий ean_code уже є
+        def insert(cur):
+            cur.execute("EXECUTE product_insert (%s, %s)", (name, code))
+            cur.execute("SELECT pg_notify(%s, '')", (NOTIFY_CHANNEL,))
+
+        try:
+            self.run(insert)
+            return True
+        except psycopg2.IntegrityError:
+            return False
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(code)
+
+    def find_product(self, code):
+        # (id, name, created_at) або None
+        if self.cache is not None:
+            hit, row = self.cache.get(code)
+            if hit:
+                return row
+
+        def select(cur):
+            cur.execute("EXECUTE product_by_code (%s)", (code,))
+            return cur.fetchone()
+
+        row = self.run(select)
+        if self.cache is not None:
+            self.cache.put(code, row)
+        return row
+
+    def find_products(self, codes):
+        # Багато кодів одним запитом (ean_code = ANY). Повертає ({код: (id, name, created_at)},
+        # [коди, яких немає]); дублікати згортаються, порядок not_found — як у вхідних кодах.
+        codes = list(dict.fromkeys(codes))
+        found = {}
+        missing = codes
+        if self.cache is not None:
+            missing = []
+            for code in codes:
+                hit, row = self.cache.get(code)
+                if not hit:
+                    missing.append(code)
+                elif row is not None:
+                    found[code] = row
+
+        if missing:
+            def select(cur):
+                cur.execute("EXECUTE products_by_codes (%s)", (missing,))
+                return cur.fetchall()
+
+            fetched = {code: (prod_id, name, created_at) for code, prod_id, name, created_at in self.run(select)}
+            found.update(fetched)
+            if self.cache is not None:
+                for code in missing:
+                    self.cache.put(code, fetched.get(code))
+
+        return found, [code for code in codes if code not in found]
+
+    def products_page(self, before_id=None, limit=PAGE_SIZE):
+        # Keyset-пагінація від найновіших: WHERE id < before_id ORDER BY id DESC LIMIT n
+        # іде по індексу первинного ключа і не залежить від глибини сторінки, на відміну від OFFSET.
+        def select(cur):
+            if before_id is None:
+                cur.execute("EXECUTE product_first_page (%s)", (limit,))
+            else:
+                cur.execute("EXECUTE product_page (%s, %s)", (before_id, limit))
+            return cur.fetchall()
+
+        return self.run(select)
+
+    def products_since(self, after_id, limit=PAGE_SIZE):
+        # Рядки з id > after_id за зростанням — усе, що додали після останнього побаченого.
+        # Таблиця лише поповнюється (оновлень і видалень немає), тож id достатньо як маркера змін.
+        def select(cur):
+            cur.execute("EXECUTE product_since (%s, %s)", (after_id or 0, limit))
+            return cur.fetchall()
+
+        return self.run(select)
+
+    def iter_products(self, page_size=PAGE_SIZE):
+        pager = ProductPager(self, page_size)
+        while not pager.exhausted:
+            yield from pager.next_page()
+
+    def all_products(self):
+        return list(self.iter_products())
+
+    def bulk_import(self, rows, chunk_size=IMPORT_CHUNK, progress=None):
+        # rows — ітерабельне (назва, код). Кожен чанк — окрема транзакція:
+        # COPY у тимчасову таблицю, далі один INSERT ... ON CONFLICT DO NOTHING.
+        # Повертає лічильники inserted / duplicate / invalid.
+        counts = {"inserted": 0, "duplicate": 0, "invalid": 0}
+        for chunk in _chunks(rows, chunk_size):
+            buf = io.StringIO()
+            staged = []
+            for name, code in chunk:
+                full_code = normalize_code(code)
+                if full_code is None:
+                    counts["invalid"] += 1
+                    continue
+                buf.write(f"{name.translate(_COPY_ESCAPES)}\t{full_code}\n")
+                staged.append(full_code)
+            if not staged:
+                continue
+
+            def merge(cur):
+                cur.execute(_STAGE_TABLE)
+                buf.seek(0)
+                cur.copy_expert("COPY products_import (name, ean_code) FROM STDIN", buf)
+                cur.execute(_STAGE_MERGE)
+                inserted = cur.rowcount
+                if inserted:
+                    cur.execute("SELECT pg_notify(%s, '')", (NOTIFY_CHANNEL,))
+                return inserted
+
+            inserted = self.run(merge)
+            counts["inserted"] += inserted
+            counts["duplicate"] += len(staged) - inserted
+            if self.cache is not None:
+                for full_code in staged:
+                    self.cache.invalidate(full_code)
+            if progress:
+                progress(counts)
+        return counts
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+
+class ProductPager:
+    # Курсор по сторінках products від найновіших; памʼятає лише останній id сторінки
+    # і найновіший (newest_id) для догрузки доданого пізніше через new_rows()
+    def __init__(self, db, page_size=PAGE_SIZE):
+        self.db = db
+        self.page_size = page_size
+        self.last_id = None
+        self.newest_id = None
+        self.exhausted = False
+
+    def next_page(self):
+        if self.exhausted:
+            return []
+        rows = self.db.products_page(self.last_id, self.page_size)
+        if len(rows) < self.page_size:
+            self.exhausted = True
+        if rows:
+            self.last_id = rows[-1][0]
+            if self.newest_id is None:
+                self.newest_id = rows[0][0]
+        return rows
+
+    def new_rows(self):
+        # Усі рядки, новіші за newest_id, за зростанням id
+        rows = []
+        while True:
+            page = self.db.products_since(self.newest_id, self.page_size)
+            rows.extend(page)
+            if page:
+                self.newest_id = page[-1][0]
+            if len(page) < self.page_size:
+                return rows
+
+    def reset(self):
+        self.last_id = None
+        self.newest_id = None
+        self.exhausted = False
+
+
+class ProductListener:
+    # Окреме зʼєднання поза пулом з LISTEN: poll() не ходить у БД, лише читає сокет,
+    # тож його можна викликати з циклу GUI щосекунди.
+    def __init__(self, config, channel=NOTIFY_CHANNEL):
+        self.config = dict(config)
+        self.channel = channel
+        self._conn = None
+        self._connect()
+
+    def _connect(self):
+        self._conn = psycopg2.connect(**self.config)
+        self._conn.autocommit = True
+        with self._conn.cursor() as cur:
+            cur.execute(f"LISTEN {self.channel}")
+
+    def poll(self):
+        # True — були зміни. Обрив зʼєднання закриває слухача і прокидає виняток:
+        # перепідключення (блокуючий connect) — справа викликача, не циклу GUI
+        try:
+            self._conn.poll()
+        except _RETRYABLE:
+            self.close()
+            raise
+        changed = bool(self._conn.notifies)
+        self._conn.notifies.clear()
+        return changed
+
+    def fileno(self):
+        return self._conn.fileno()
+
+    def close(self):
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _config_from_args(args):
+    return {"dsn": args.dsn} if args.dsn else {}
+
+
+def _read_lookup(path):
+    # Рядок — або голий код, або JSONL-запис з полем "code" (вихід ean13.decode_batch)
+    fp = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in fp:
+            line = line.strip()
+            if not line:
+                continue
+            yield json.loads(line) if line.startswith("{") else {"code": line}
+    finally:
+        if fp is not sys.stdin:
+            fp.close()
+
+
+def _lookup(db, args):
+    # Дописує до кожного запису поле "product"; один запит на LOOKUP_CHUNK записів
+    started = time.perf_counter()
+    total = found_count = queries = 0
+    for chunk in _chunks(_read_lookup(args.source), args.chunk_size):
+        found, _ = db.find_products(r["code"] for r in chunk if r.get("code"))
+        queries += 1
+        for record in chunk:
+            row = found.get(record.get("code"))
+            record["product"] = None if row is None else {
+                "id": row[0], "name": row[1], "created_at": row[2].isoformat() if row[2] else None}
+            found_count += row is not None
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        total += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"Звірено {total} записів за {elapsed:.2f} с ({queries} запитів): знайдено {found_count}, "
+          f"не знайдено {total - found_count}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Робота з таблицею products")
+    parser.add_argument("--dsn", default="", help="рядок підключення libpq, напр. 'dbname=Barcode user=postgres'")
+    commands = parser.add_subparsers(dest="command", required=True)
+    imp = commands.add_parser("import", help="масовий імпорт товарів із CSV/JSONL (назва, код)")
+    imp.add_argument("feed", help="CSV або JSONL; '-' — stdin")
+    imp.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK)
+    look = commands.add_parser("lookup", help="звірка кодів (по одному на рядок або JSONL з decode_batch) з БД")
+    look.add_argument("source", help="файл або '-' — stdin")
+    look.add_argument("--chunk-size", type=int, default=LOOKUP_CHUNK)
+    args = parser.parse_args(argv)
+
+    db = ProductDB(_config_from_args(args), 1, 1)
+    if args.command == "lookup":
+        try:
+            return _lookup(db, args)
+        finally:
+            db.close()
+    started = time.perf_counter()
+
+    def report(counts):
+        done = sum(counts.values())
+        sys.stderr.write(f"\rОброблено: {done}  додано: {counts['inserted']}  "
+                         f"дублікатів: {counts['duplicate']}  невірних: {counts['invalid']}")
+        sys.stderr.flush()
+
+    try:
+        counts = db.bulk_import(read_feed(args.feed), args.chunk_size, report)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"\nІмпорт завершено за {elapsed:.2f} с: додано {counts['inserted']}, "
+          f"дублікатів {counts['duplicate']}, з невірною контрольною цифрою {counts['invalid']} "
+          f"({total / elapsed if elapsed else 0:.0f} рядків/с)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# Пакетне декодування каталогу або списку шляхів зі stdin у пулі процесів.
+# Кожен воркер тримає один екземпляр EAN13ManualDecoder; результати пишуться
+# як JSONL у порядку завершення, наприкінці — звіт про пропускну здатність.
+#
+#   python -m ean13.decode_batch /data/scans > results.jsonl
+#   find /data -name '*.png' | python -m ean13.decode_batch - --method runs
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .decoder import EAN13ManualDecoder
+from .labels import _chunks
+from .scan import load_gray
+from .tiled import MAX_PIXELS
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".gif")
+
+_decoder = None
+
+
+def iter_paths(source, extensions=IMAGE_EXTENSIONS):
+    # Каталог обходиться рекурсивно; "-" — по одному шляху на рядок зі stdin
+    if source == "-":
+        for line in sys.stdin:
+            path = line.strip()
+            if path:
+                yield path
+        return
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(extensions):
+                yield os.path.join(root, name)
+
+
+def _init_worker():
+    # Воркер лише декодує файли, тож захист PIL від «бомб» піднімаємо до межі tiled для всього процесу
+    from PIL import Image
+
+    global _decoder
+    _decoder = EAN13ManualDecoder()
+    Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+
+
+def _decode_chunk(paths, scanlines, method, locate):
+    from PIL import Image
+
+    records = []
+    for path in paths:
+        started = time.perf_counter()
+        record = {"path": path, "code": None, "confidence": 0.0}
+        try:
+            gray = load_gray(path)
+            record["code"], record["confidence"] = _decoder.decode_array_with_confidence(
+                gray, scanlines, method, locate)
+        except (ValueError, OSError, Image.DecompressionBombError) as e:
+            record["error"] = str(e)
+        record["elapsed"] = round(time.perf_counter() - started, 6)
+        records.append(record)
+    return records
+
+
+def decode_paths(paths, workers=None, chunk_size=16, scanlines=None, method="grid", locate=False):
+    # Генератор записів у порядку завершення; у польоті — не більше 2×workers чанків
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    chunks = _chunks(paths, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_decode_chunk, chunk, scanlines, method, locate))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетне декодування зображень EAN-13 у JSONL")
+    parser.add_argument("source", help="каталог зі сканами або '-' для списку шляхів зі stdin")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--scanlines", type=int, default=None)
+    parser.add_argument("--method", choices=("grid", "runs", "tiered"), default="grid")
+    parser.add_argument("--locate", action="store_true", help="шукати штрих-код на великому зображенні")
+    args = parser.parse_args(argv)
+
+    total = decoded = 0
+    started = time.perf_counter()
+    for record in decode_paths(iter_paths(args.source), args.workers, args.chunk_size,
+                               args.scanlines, args.method, args.locate):
+        total += 1
+        decoded += record["code"] is not None
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed else 0.0
+    print(f"Оброблено: {total} зображень, розпізнано {decoded}, не розпізнано {total - decoded} "
+          f"за {elapsed:.2f} с ({rate:.0f} зображень/с)", file=sys.stderr)
+    return 0 if decoded == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
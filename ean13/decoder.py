@@ -0,0 +1,134 @@
+from .encoder import calculate_check_digit, modules_from_bytes
+from .tables import (
+    MODULES, SYMBOL_DECODE, PARITY_DECODE, INVALID, SET_G, SET_R, START_VALUE, END_VALUE,
+)
+
+_ZERO = ord('0')
+
+
+def decode_modules(value):
+    # 95-бітне число модулів -> 13-значний код; перевіряє маркери, парність і контрольну цифру
+    if value >> 92 != START_VALUE or value & 0b111 != END_VALUE:
+        raise ValueError("Невірні маркери старту/стопу. Можливо зображення нечітке.")
+
+    digits = bytearray(13)
+    parity = 0
+    for i in range(6):
+        chunk = (value >> (85 - 7 * i)) & 0x7F
+        entry = SYMBOL_DECODE[chunk]
+        if entry == INVALID or entry >= SET_R * 10:
+            raise ValueError(f"Невідомий код лівої частини: {chunk:07b}")
+        parity = (parity << 1) | (entry >= SET_G * 10)
+        digits[i + 1] = _ZERO + entry % 10
+
+    for i in range(6):
+        chunk = (value >> (38 - 7 * i)) & 0x7F
+        entry = SYMBOL_DECODE[chunk]
+        if entry == INVALID or entry < SET_R * 10:
+            raise ValueError(f"Невідомий код правої частини: {chunk:07b}")
+        digits[i + 7] = _ZERO + entry - SET_R * 10
+
+    first_digit = PARITY_DECODE[parity]
+    if first_digit == INVALID:
+        raise ValueError(f"Невідомий шаблон парності: {parity:06b}")
+    digits[0] = _ZERO + first_digit
+    full_code = digits.decode('ascii')
+
+    if calculate_check_digit(full_code) != ord(full_code[12]) - _ZERO:
+        raise ValueError(f"Невірна контрольна цифра: {full_code}")
+    return full_code
+
+
+class EAN13ManualDecoder:
+    def decode_image_file(self, filepath, scanlines=None, method="grid", locate=False):
+        from .scan import load_gray
+
+        return self.decode_array(load_gray(filepath), scanlines, method, locate)
+
+    def decode_buffer(self, buffer, width, height, stride=None, offset=0, scanlines=None, method="grid",
+                      locate=False):
+        # Сирий 8-бітний кадр у bytes/bytearray/memoryview/mmap; читається без копії
+        from .frames import as_gray
+
+        return self.decode_array(as_gray(buffer, width, height, stride, offset), scanlines, method, locate)
+
+    def decode_frames(self, archive, scanlines=None, method="grid"):
+        # Проходить FrameArchive; для кожного кадру — (індекс, код або None, впевненість)
+        for index, gray in enumerate(archive):
+            try:
+                code, confidence = self.decode_array_with_confidence(gray, scanlines, method)
+            except ValueError:
+                code, confidence = None, 0.0
+            yield index, code, confidence
+
+    def decode_array(self, gray, scanlines=None, method="grid", locate=False):
+        code, _ = self.decode_array_with_confidence(gray, scanlines, method, locate)
+        return code
+
+    def decode_array_with_confidence(self, gray, scanlines=None, method="grid", locate=False):
+        # method: "grid" — рівномірна сітка з 95 модулів, "runs" — довжини серій (стійкий до масштабу),
+        # "tiered" — від найдешевшого шляху до дорожчих, поки код не пройде перевірки;
+        # locate=True — спершу знайти штрих-код на великому зображенні й декодувати лише вирізані ділянки
+        from . import runlength, scan
+
+        if locate:
+            return self._decode_located(gray, scanlines, method)
+        if method == "grid":
+            return scan.decode_gray(gray, scanlines or scan.DEFAULT_SCANLINES)
+        if method == "runs":
+            return runlength.decode_gray(gray, scanlines or scan.DEFAULT_SCANLINES)
+        if method == "tiered":
+            result = self.decode_tiered(gray, scanlines)
+            if result.code is None:
+                reason = result.attempts[-1].error if result.attempts else "немає ступенів декодування"
+                raise ValueError(f"Помилка читання (шум): {reason}")
+            return result.code, result.confidence
+        raise ValueError(f"Невідомий метод декодування: {method}")
+
+    def decode_tiered_file(self, filepath, scanlines=None, tiers=None, min_confidence=None):
+        from .scan import load_gray
+
+        return self.decode_tiered(load_gray(filepath), scanlines, tiers, min_confidence)
+
+    def decode_tiered(self, gray, scanlines=None, tiers=None, min_confidence=None):
+        # TieredResult(code, confidence, tier, elapsed, attempts); code = None, якщо не вдалося.
+        # min_confidence=None — поріг tiers.MIN_CONFIDENCE
+        from .scan import DEFAULT_SCANLINES
+        from .tiers import decode_tiered
+
+        return decode_tiered(gray, scanlines or DEFAULT_SCANLINES, tiers, min_confidence)
+
+    def decode_all_file(self, filepath, scanlines=None, method="runs"):
+        from .scan import load_gray
+
+        return self.decode_all(load_gray(filepath), scanlines, method)
+
+    def decode_all(self, gray, scanlines=None, method="runs"):
+        # Усі штрих-коди на зображенні: список Detection(code, box, confidence, angle)
+        from .multi import decode_all
+        from .scan import DEFAULT_SCANLINES
+
+        return decode_all(gray, scanlines or DEFAULT_SCANLINES, method)
+
+    def _decode_located(self, gray, scanlines, method):
+        from .locate import crop_region, locate_levels
+
+        # Якщо жоден кандидат рівня не декодувався — наступний, дрібніший рівень піраміди
+        for regions in locate_levels(gray):
+            for region in regions:
+                try:
+                    return self.decode_array_with_confidence(crop_region(gray, region), scanlines, method)
+                except ValueError:
+                    continue
+        raise ValueError("Штрих-код не знайдено на зображенні")
+
+    def decode_binary(self, binary_string):
+        if len(binary_string) != MODULES:
+            raise ValueError(f"Очікується {MODULES} модулів, отримано {len(binary_string)}")
+        return self.decode_modules(int(binary_string, 2))
+
+    def decode_bytes(self, data):
+        return self.decode_modules(modules_from_bytes(data))
+
+    def decode_modules(self, value):
+        return decode_modules(value)
@@ -0,0 +1,88 @@
+from .tables import (
+    L_CODES, G_CODES, R_CODES, PARITY_PATTERNS, MODULES,
+    L_VALUES, G_VALUES, R_VALUES, PARITY_MASKS, START_VALUE, CENTER_VALUE, END_VALUE,
+)
+
+_ZERO = ord('0')
+
+
+def calculate_check_digit(code_12):
+    sum_odd = sum(ord(code_12[i]) - _ZERO for i in range(0, 12, 2))  # Позиції 1, 3...
+    sum_even = sum(ord(code_12[i]) - _ZERO for i in range(1, 12, 2))  # Позиції 2, 4...
+    total = sum_odd + (sum_even * 3)
+    remainder = total % 10
+    return 0 if remainder == 0 else 10 - remainder
+
+
+def encode_int(code_input):
+    # isdigit() пропускає й не-ASCII цифри ('١', '²'), а ord(c) - 48 розрахований лише на 0-9
+    if len(code_input) != 12 or not (code_input.isascii() and code_input.isdigit()):
+        raise ValueError("Код має містити рівно 12 цифр!")
+
+    full_code = code_input + str(calculate_check_digit(code_input))
+    parity = PARITY_MASKS[ord(full_code[0]) - _ZERO]
+
+    value = START_VALUE
+    for i in range(1, 7):
+        table = G_VALUES if parity >> (6 - i) & 1 else L_VALUES
+        value = (value << 7) | table[ord(full_code[i]) - _ZERO]
+    value = (value << 5) | CENTER_VALUE
+    for i in range(7, 13):
+        value = (value << 7) | R_VALUES[ord(full_code[i]) - _ZERO]
+    value = (value << 3) | END_VALUE
+    return full_code, value
+
+
+def modules_to_bytes(value):
+    return (value << 1).to_bytes(12, 'big')
+
+
+def modules_from_bytes(data):
+    return int.from_bytes(data, 'big') >> 1
+
+
+def modules_to_string(value):
+    return format(value, f'0{MODULES}b')
+
+
+class EAN13ManualGenerator:
+    def __init__(self):
+        self.L_CODES = L_CODES
+        self.G_CODES = G_CODES
+        self.R_CODES = R_CODES
+        self.PARITY_PATTERNS = PARITY_PATTERNS
+
+    def calculate_check_digit(self, code_12):
+        return calculate_check_digit(code_12)
+
+    def encode_int(self, code_input):
+        return encode_int(code_input)
+
+    def encode_bytes(self, code_input):
+        full_code, value = encode_int(code_input)
+        return full_code, modules_to_bytes(value)
+
+    def encode(self, code_input):
+        full_code, value = encode_int(code_input)
+        return full_code, modules_to_string(value)
+
+    def encode_many(self, codes, packed=False):
+        from .batch import encode_many
+
+        return encode_many(codes, packed=packed)
+
+    def write_vector(self, code_input, fp, fmt="svg", **options):
+        # fp — текстовий файл для svg/zpl, бінарний для pdf
+        from .vector import WRITERS
+
+        if fmt not in WRITERS:
+            raise ValueError(f"Невідомий формат: {fmt}")
+        full_code, value = encode_int(code_input)
+        WRITERS[fmt](fp, full_code, value, **options)
+        return full_code
+
+    def generate_image(self, code_input, **render_options):
+        from .render import render_image
+
+        full_code, value = encode_int(code_input)
+        return render_image(full_code, value, **render_options), full_code
@@ -0,0 +1,67 @@
+# Декодування прямо з пам'яті: сирі 8-бітні кадри у bytes/memoryview/NumPy
+# та архіви з кадрів фіксованого розміру, склеєних в один файл (через mmap).
+# Пікселі читаються з буфера як є — без тимчасових файлів і без PIL.
+
+import mmap
+import os
+
+import numpy as np
+
+
+def as_gray(buffer, width, height, stride=None, offset=0):
+    # Представлення буфера як масиву height×width без копіювання;
+    # stride — байтів на рядок (якщо рядки вирівняні з доповненням)
+    if isinstance(buffer, np.ndarray) and buffer.ndim == 2:
+        return buffer
+    stride = stride or width
+    if stride < width:
+        raise ValueError(f"Крок рядка {stride} менший за ширину кадру {width}")
+    size = len(memoryview(buffer).cast('B'))
+    needed = offset + stride * (height - 1) + width
+    if size < needed:
+        raise ValueError(f"Буфер замалий для кадру {width}×{height}: {size} < {needed} байт")
+    return np.ndarray((height, width), dtype=np.uint8, buffer=buffer, offset=offset, strides=(stride, 1))
+
+
+class FrameArchive:
+    # Файл із послідовних кадрів однакового розміру; header — байти перед кожним кадром
+    def __init__(self, path, width, height, stride=None, header=0):
+        self.width = width
+        self.height = height
+        self.stride = stride or width
+        self.header = header
+        self.frame_size = header + self.stride * height
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._count = size // self.frame_size
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f"Кадр {index} поза межами архіву ({self._count} кадрів)")
+        offset = index * self.frame_size + self.header
+        return as_gray(self._mmap, self.width, self.height, self.stride, offset)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def close(self):
+        # Масиви-представлення, що ще посилаються на mmap, не дають його закрити
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,283 @@
+# Масова генерація етикеток із CSV/JSONL-фіду (назва + 12 цифр).
+# Фід читається потоково, кодування й рендер — у пулі процесів чанками;
+# у польоті тримається обмежена кількість чанків, тож пам'ять не залежить від розміру фіду.
+#
+#   python -m ean13.labels products.csv -o out --format svg
+#   python -m ean13.labels products.jsonl -o out --sheet pdf
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .encoder import EAN13ManualGenerator
+from .render import COMPRESSION_LEVELS, IMAGE_MODES
+
+FILE_FORMATS = ("png", "svg", "pdf", "zpl")
+SHEET_FORMATS = ("pdf", "png")
+MAX_REPORTED_ERRORS = 10  # помилкових рядків, що зберігаються для звіту; решта лише рахується
+
+A4_PT = (595.28, 841.89)
+SHEET_MARGIN_PT = 28.35  # 10 мм
+SHEET_GAP_PT = 8.5       # 3 мм між етикетками
+
+_generator = None
+
+
+def read_feed(path):
+    # Потоково віддає (назва, код) з CSV або JSONL; "-" — stdin
+    fp = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+    try:
+        first = fp.readline()
+        if first.lstrip().startswith("{"):
+            for line in _chain(first, fp):
+                if line.strip():
+                    row = json.loads(line)
+                    yield str(row.get("name", "")), str(row.get("code", row.get("ean_code", "")))
+        else:
+            reader = csv.reader(_chain(first, fp))
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) == 1:
+                    name, code = "", row[0]
+                else:
+                    name, code = row[0], row[1]
+                code = code.strip()
+                if reader.line_num == 1 and not (code.isascii() and code.isdigit()):
+                    continue  # заголовок
+                yield name, code
+    finally:
+        if fp is not sys.stdin:
+            fp.close()
+
+
+def _chain(first, fp):
+    yield first
+    yield from fp
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _init_worker():
+    global _generator
+    _generator = EAN13ManualGenerator()
+
+
+def _render_files(chunk, out_dir, fmt, options, compression):
+    # Режим окремих файлів: воркер сам пише файли, повертає лише лічильники
+    from .render import save_png
+
+    done, errors = 0, []
+    for name, code in chunk:
+        try:
+            if fmt == "png":
+                img, full_code = _generator.generate_image(code, **options)
+                save_png(img, os.path.join(out_dir, f"barcode_{full_code}.png"), compression)
+            else:
+                full_code, _ = _generator.encode_int(code)
+                mode = "wb" if fmt == "pdf" else "w"
+                with open(os.path.join(out_dir, f"barcode_{full_code}.{fmt}"), mode) as fp:
+                    _generator.write_vector(code, fp, fmt, **options)
+            done += 1
+        except ValueError as e:
+            errors.append((name, code, str(e)))
+    return done, errors, []
+
+
+def _render_sheet_items(chunk, fmt, options):
+    # Режим аркушів: воркер повертає готові фрагменти, збирає сторінки головний процес
+    from .vector import pdf_barcode_ops
+
+    items, errors = [], []
+    for name, code in chunk:
+        try:
+            if fmt == "pdf":
+                full_code, value = _generator.encode_int(code)
+                items.append(pdf_barcode_ops(full_code, value, **options))
+            else:
+                img, _ = _generator.generate_image(code, **options)
+                items.append((img.size, img.convert('L').tobytes()))
+        except ValueError as e:
+            errors.append((name, code, str(e)))
+    return len(items), errors, items
+
+
+class _PdfSheets:
+    def __init__(self, path, options):
+        from .vector import PdfWriter, pdf_label_size
+
+        self.fp = open(path, "wb")
+        self.pdf = PdfWriter(self.fp)
+        self.label_w, self.label_h = pdf_label_size(**options)
+        usable_w = A4_PT[0] - 2 * SHEET_MARGIN_PT + SHEET_GAP_PT
+        usable_h = A4_PT[1] - 2 * SHEET_MARGIN_PT + SHEET_GAP_PT
+        self.cols = max(1, int(usable_w // (self.label_w + SHEET_GAP_PT)))
+        self.rows = max(1, int(usable_h // (self.label_h + SHEET_GAP_PT)))
+        self.ops = []
+        self.pages = 0
+
+    def add(self, item):
+        i = len(self.ops)
+        col, row = i % self.cols, i // self.cols
+        x = SHEET_MARGIN_PT + col * (self.label_w + SHEET_GAP_PT)
+        y = A4_PT[1] - SHEET_MARGIN_PT - (row + 1) * self.label_h - row * SHEET_GAP_PT
+        self.ops.append(b"q 1 0 0 1 %.2f %.2f cm\n" % (x, y) + item + b"Q\n")
+        if len(self.ops) == self.cols * self.rows:
+            self.flush()
+
+    def flush(self):
+        if self.ops:
+            self.pdf.add_page(A4_PT[0], A4_PT[1], b"".join(self.ops))
+            self.ops = []
+            self.pages += 1
+
+    def close(self):
+        self.flush()
+        self.pdf.close()
+        self.fp.close()
+
+
+class _PngSheets:
+    def __init__(self, out_dir, compression="default", cols=3, rows=8, gap=20):
+        self.out_dir = out_dir
+        self.compression = compression
+        self.cols, self.rows, self.gap = cols, rows, gap
+        self.canvas = None
+        self.count = 0
+        self.pages = 0
+
+    def add(self, item):
+        import numpy as np
+
+        (w, h), data = item
+        if self.canvas is None:
+            self.cell = (w + self.gap, h + self.gap)
+            self.canvas = np.full((self.rows * self.cell[1], self.cols * self.cell[0]), 255, dtype=np.uint8)
+        col, row = self.count % self.cols, self.count // self.cols
+        x, y = col * self.cell[0], row * self.cell[1]
+        self.canvas[y:y + h, x:x + w] = np.frombuffer(data, dtype=np.uint8).reshape(h, w)
+        self.count += 1
+        if self.count == self.cols * self.rows:
+            self.flush()
+
+    def flush(self):
+        from PIL import Image
+
+        from .render import save_png
+
+        if self.count:
+            self.pages += 1
+            path = os.path.join(self.out_dir, f"sheet_{self.pages:04d}.png")
+            save_png(Image.fromarray(self.canvas >= 128), path, self.compression)
+            self.canvas[:] = 255
+            self.count = 0
+
+    def close(self):
+        self.flush()
+
+
+def generate_labels(rows, out_dir, fmt="png", sheet=None, workers=None, chunk_size=256,
+                    options=None, progress=None, compression="default"):
+    # Повертає словник зі статистикою; progress(done, errors, elapsed) викликається після кожного чанка
+    options = options or {}
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+
+    if sheet == "pdf":
+        sink = _PdfSheets(os.path.join(out_dir, "labels.pdf"), options)
+    elif sheet == "png":
+        sink = _PngSheets(out_dir, compression)
+    else:
+        sink = None
+
+    # Зберігаються лише перші MAX_REPORTED_ERRORS помилок, решта — лічильником
+    done, error_count, first_errors = 0, 0, []
+    started = time.perf_counter()
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        def collect():
+            nonlocal done, error_count
+            count, chunk_errors, items = pending.popleft().result()
+            for item in items:
+                sink.add(item)
+            done += count
+            error_count += len(chunk_errors)
+            first_errors.extend(chunk_errors[:MAX_REPORTED_ERRORS - len(first_errors)])
+            if progress:
+                progress(done, error_count, time.perf_counter() - started)
+
+        for chunk in _chunks(rows, chunk_size):
+            if sink is None:
+                pending.append(pool.submit(_render_files, chunk, out_dir, fmt, options, compression))
+            else:
+                pending.append(pool.submit(_render_sheet_items, chunk, sheet, options))
+            # Результати забираються по порядку — аркуші зберігають порядок фіду
+            while len(pending) >= max_in_flight:
+                collect()
+        while pending:
+            collect()
+
+    if sink is not None:
+        sink.close()
+    elapsed = time.perf_counter() - started
+    return {
+        "labels": done,
+        "errors": error_count,
+        "first_errors": first_errors,
+        "pages": sink.pages if sink is not None else 0,
+        "elapsed": elapsed,
+        "rate": done / elapsed if elapsed else 0.0,
+    }
+
+
+def _print_progress(done, errors, elapsed):
+    rate = done / elapsed if elapsed else 0.0
+    sys.stderr.write(f"\rЕтикеток: {done}  помилок: {errors}  {rate:.0f}/с")
+    sys.stderr.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Масова генерація етикеток EAN-13 з CSV/JSONL")
+    parser.add_argument("feed", help="CSV (назва,код) або JSONL ({\"name\", \"code\"}); '-' — stdin")
+    parser.add_argument("-o", "--out", default="labels", help="каталог для результатів")
+    parser.add_argument("--format", choices=FILE_FORMATS, default="png", help="формат окремих файлів")
+    parser.add_argument("--sheet", choices=SHEET_FORMATS, help="збирати етикетки в аркуші замість окремих файлів")
+    parser.add_argument("--mode", choices=IMAGE_MODES, default="1",
+                        help="режим PNG: 1 — 1 біт/піксель, P — 2-кольорова палітра, L — 8-бітні відтінки сірого")
+    parser.add_argument("--compression", choices=tuple(COMPRESSION_LEVELS), default="default",
+                        help="рівень стиснення PNG: fast для превʼю, max для архіву")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--quiet", action="store_true", help="без індикатора прогресу")
+    args = parser.parse_args(argv)
+
+    raster = args.sheet == "png" or (args.sheet is None and args.format == "png")
+    stats = generate_labels(read_feed(args.feed), args.out, args.format, args.sheet, args.workers,
+                            args.chunk_size, options={"mode": args.mode} if raster else None,
+                            progress=None if args.quiet else _print_progress, compression=args.compression)
+    if not args.quiet:
+        sys.stderr.write("\n")
+    for name, code, error in stats["first_errors"]:
+        print(f"Пропущено {name!r} ({code}): {error}", file=sys.stderr)
+    print(f"Готово: {stats['labels']} етикеток, {stats['errors']} помилок, "
+          f"{stats['pages']} аркушів за {stats['elapsed']:.2f} с ({stats['rate']:.0f} етикеток/с)")
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
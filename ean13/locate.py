@@ -0,0 +1,172 @@
+# Пошук штрих-кодів на великих зображеннях (скани сторінок, фото з телефона).
+# Працює на зменшеній копії: у комірках рахується тензор структури градієнта;
+# штрих-код — це ділянка з сильним і однонапрямленим градієнтом. Сусідні такі
+# комірки з близьким кутом обʼєднуються в кандидатів, і декодеру передаються
+# лише вирізані й вирівняні фрагменти.
+
+from collections import deque, namedtuple
+
+import numpy as np
+
+# box — (ліво, верх, право, низ) у пікселях оригіналу;
+# angle — кут градієнта в градусах (0 — вертикальні штрихи); score — сила відгуку
+Region = namedtuple("Region", ["box", "angle", "score"])
+
+WORK_SIZE = 1024     # найбільша сторона зменшеної копії для першого рівня піраміди
+CELL = 8             # розмір комірки на зменшеній копії, пікселів
+MIN_COHERENCE = 0.6
+ENERGY_FRACTION = 0.15  # поріг енергії відносно 99-го перцентиля по зображенню
+PAD_CELLS = 2        # запас навколо ділянки на тиху зону й краї, комірок
+MIN_CELLS = 6
+ANGLE_TOLERANCE = 20.0
+
+
+def downsample(gray, factor):
+    if factor <= 1:
+        return gray.astype(np.float32)
+    h, w = gray.shape[0] // factor * factor, gray.shape[1] // factor * factor
+    return gray[:h, :w].reshape(h // factor, factor, w // factor, factor).mean(axis=(1, 3), dtype=np.float32)
+
+
+def cell_tensor(small, cell=CELL):
+    # Сума компонент тензора структури по комірках: енергія, когерентність, кут
+    gx = np.zeros_like(small)
+    gy = np.zeros_like(small)
+    gx[:, 1:-1] = small[:, 2:] - small[:, :-2]
+    gy[1:-1, :] = small[2:, :] - small[:-2, :]
+    h, w = small.shape[0] // cell * cell, small.shape[1] // cell * cell
+
+    def pool(a):
+        return a[:h, :w].reshape(h // cell, cell, w // cell, cell).sum(axis=(1, 3))
+
+    # Вікно інтегрування 3×3 комірки: комірки всередині широких штрихів
+    # отримують орієнтацію сусідів, і штрих-код не розпадається на шматки
+    jxx, jyy, jxy = (_box3(pool(g)) for g in (gx * gx, gy * gy, gx * gy))
+    energy = jxx + jyy
+    coherence = np.sqrt((jxx - jyy) ** 2 + 4 * jxy ** 2) / np.maximum(energy, 1e-6)
+    angle = np.degrees(0.5 * np.arctan2(2 * jxy, jxx - jyy))
+    return energy, coherence, angle
+
+
+def _box3(a):
+    padded = np.pad(a, 1, mode='edge')
+    h, w = a.shape
+    return sum(padded[dy:dy + h, dx:dx + w] for dy in range(3) for dx in range(3))
+
+
+def _angle_diff(a, b):
+    d = abs(a - b) % 180.0
+    return min(d, 180.0 - d)
+
+
+def _components(mask, angle):
+    # Звʼязні групи комірок (4-сусідство) з близьким кутом градієнта
+    seen = np.zeros_like(mask)
+    rows, cols = mask.shape
+    for y0, x0 in zip(*np.nonzero(mask)):
+        if seen[y0, x0]:
+            continue
+        seen[y0, x0] = True
+        queue, cells = deque([(y0, x0)]), []
+        while queue:
+            y, x = queue.popleft()
+            cells.append((y, x))
+            for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                if (0 <= ny < rows and 0 <= nx < cols and mask[ny, nx] and not seen[ny, nx]
+                        and _angle_diff(angle[ny, nx], angle[y, x]) < ANGLE_TOLERANCE):
+                    seen[ny, nx] = True
+                    queue.append((ny, nx))
+        yield cells
+
+
+def _mean_angle(angles, weights):
+    # Кути визначені за модулем 180°, тому усереднюються подвоєні
+    doubled = np.radians(2 * np.asarray(angles))
+    return float(np.degrees(np.arctan2((weights * np.sin(doubled)).sum(), (weights * np.cos(doubled)).sum())) / 2)
+
+
+def locate_level(gray, factor, cell=CELL):
+    small = downsample(gray, factor)
+    energy, coherence, angle = cell_tensor(small, cell)
+    if energy.size == 0:
+        return []
+    threshold = np.percentile(energy, 99) * ENERGY_FRACTION
+    mask = (energy > threshold) & (coherence > MIN_COHERENCE)
+
+    regions = []
+    scale = cell * factor
+    height, width = gray.shape
+    for cells in _components(mask, angle):
+        if len(cells) < MIN_CELLS:
+            continue
+        ys, xs = np.array(cells).T
+        weights = energy[ys, xs]
+        left = max(0, int((xs.min() - PAD_CELLS) * scale))
+        top = max(0, int((ys.min() - PAD_CELLS) * scale))
+        right = min(width, int((xs.max() + 1 + PAD_CELLS) * scale))
+        bottom = min(height, int((ys.max() + 1 + PAD_CELLS) * scale))
+        score = float(weights.sum() * coherence[ys, xs].mean())
+        regions.append(Region((left, top, right, bottom), _mean_angle(angle[ys, xs], weights), score))
+    regions.sort(key=lambda r: r.score, reverse=True)
+    return regions
+
+
+def refine_angle(gray, box, peaks=32):
+    # На грубому рівні дрібні штрихи дають муар, а різницеві градієнти на
+    # частих штрихах тягнуть кут до 45°. Тому кут уточнюється за спектром
+    # ділянки на повній роздільності: всі гармоніки штрихів лежать на одній
+    # прямій через нуль, напрямок якої і є напрямком градієнта.
+    left, top, right, bottom = box
+    crop = gray[top:bottom, left:right].astype(np.float32)
+    if min(crop.shape) < 8:
+        return None
+    crop -= crop.mean()
+    window = np.outer(np.hanning(crop.shape[0]), np.hanning(crop.shape[1])).astype(np.float32)
+    power = np.abs(np.fft.rfft2(crop * window)) ** 2
+    fy = np.fft.fftfreq(crop.shape[0])[:, None]
+    fx = np.fft.rfftfreq(crop.shape[1])[None, :]
+    power[np.hypot(fy * crop.shape[0], fx * crop.shape[1]) < 4] = 0  # без низьких частот і DC
+    top_bins = np.argpartition(power.ravel(), -peaks)[-peaks:]
+    ys, xs = np.unravel_index(top_bins, power.shape)
+    angles = np.degrees(np.arctan2(fy[ys, 0], fx[0, xs]))
+    return _mean_angle(angles, power[ys, xs])
+
+
+def _refined(gray, region):
+    angle = refine_angle(gray, region.box)
+    return region if angle is None else region._replace(angle=angle)
+
+
+def locate_levels(gray, work_size=WORK_SIZE):
+    # Піраміда від грубого рівня до дрібнішого: для кожного рівня — список кандидатів.
+    # Генератор: наступний рівень рахується, лише якщо споживачу не вистачило попереднього
+    # (дрібні штрихи на грубому рівні зливаються чи губляться в муарі).
+    factor = max(1, int(np.ceil(max(gray.shape) / work_size)))
+    while True:
+        regions = locate_level(gray, factor)
+        if factor > 1:
+            regions = [_refined(gray, r) for r in regions]
+        yield regions
+        if factor == 1:
+            return
+        factor = max(1, factor // 2)
+
+
+def locate(gray, work_size=WORK_SIZE):
+    # Кандидати з найгрубішого рівня, що дав хоч один
+    for regions in locate_levels(gray, work_size):
+        if regions:
+            return regions
+    return []
+
+
+def crop_region(gray, region):
+    # Вирізає ділянку й повертає її так, щоб штрихи стали вертикальними
+    from PIL import Image
+
+    left, top, right, bottom = region.box
+    crop = gray[top:bottom, left:right]
+    if abs(region.angle) < 2.0:
+        return crop
+    img = Image.fromarray(crop).rotate(region.angle, resample=Image.BILINEAR, expand=True, fillcolor=255)
+    return np.asarray(img)
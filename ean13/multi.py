@@ -0,0 +1,74 @@
+# Декодування всіх штрих-кодів на одному зображенні (фото полиць, аркуші етикеток).
+# Зображення завантажується й локалізується один раз; кожна знайдена ділянка —
+# це зріз того самого масиву, без повторного відкриття чи конвертації.
+
+from collections import namedtuple
+
+from . import runlength, scan
+from .locate import crop_region, locate_levels
+
+# Ділянка, витягнута більше ніж у стільки разів, — це кілька символів, злитих на грубому рівні
+MAX_ASPECT = 4.0
+
+# box — (ліво, верх, право, низ) у пікселях; confidence — 0..1; angle — кут градієнта, градуси
+Detection = namedtuple("Detection", ["code", "box", "confidence", "angle"])
+
+
+def _overlap(a, b):
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    if w <= 0 or h <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return w * h / smaller if smaller else 0.0
+
+
+def merge_detections(detections, min_overlap=0.5):
+    # Однаковий код у ділянках, що перекриваються, рахується один раз (з кращою впевненістю);
+    # той самий код у різних місцях (кілька однакових етикеток) — окремо
+    merged = []
+    for detection in detections:
+        duplicate = next((i for i, d in enumerate(merged)
+                          if d.code == detection.code and _overlap(d.box, detection.box) > min_overlap), None)
+        if duplicate is None:
+            merged.append(detection)
+        elif detection.confidence > merged[duplicate].confidence:
+            merged[duplicate] = detection
+    merged.sort(key=lambda d: (d.box[1], d.box[0]))
+    return merged
+
+
+def _oversized(region):
+    w = region.box[2] - region.box[0]
+    h = region.box[3] - region.box[1]
+    return max(w, h) > MAX_ASPECT * min(w, h)
+
+
+def decode_all(gray, scanlines=scan.DEFAULT_SCANLINES, method="runs", regions=None):
+    # Повертає список Detection, відсортований зверху вниз і зліва направо.
+    # На грубому рівні піраміди сусідні етикетки зливаються в одну ділянку, тож рівень
+    # приймається, лише якщо кожна його ділянка декодувалась і схожа на один символ;
+    # інакше спускаємось на дрібніший, а знахідки всіх рівнів зводимо merge_detections
+    decode = runlength.decode_gray if method == "runs" else scan.decode_gray
+    detections, oversized = [], []
+    for level in (locate_levels(gray) if regions is None else [regions]):
+        complete = bool(level)
+        for region in level:
+            try:
+                code, confidence = decode(crop_region(gray, region), scanlines)
+            except ValueError:
+                complete = False
+                continue
+            detection = Detection(code, region.box, confidence, region.angle)
+            if _oversized(region):
+                complete = False
+                oversized.append(detection)
+            else:
+                detections.append(detection)
+        if complete:
+            break
+    # Злита ділянка поглинула б кілька однакових етикеток під нею, тому вона йде в результат,
+    # лише якщо дрібніші рівні не знайшли на її місці того самого коду
+    detections += [d for d in oversized
+                   if not any(x.code == d.code and _overlap(x.box, d.box) > 0 for x in detections)]
+    return merge_detections(detections)
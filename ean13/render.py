@@ -0,0 +1,162 @@
+# PIL і NumPy імпортуються всередині функцій, щоб "import ean13" лишався швидким
+# і не вимагав дисплея чи графічних бібліотек у воркерах, яким він не потрібен.
+
+from functools import lru_cache
+
+from .tables import MODULES, START_GUARD, CENTER_GUARD, END_GUARD
+
+TOP_MARGIN = 10   # відступ над штрихами, пікселів
+TEXT_AREA = 50    # місце під цифрами, пікселів
+
+# Ділянки даних у модулях: ліва половина 3..45, права 50..92
+_DATA_SPANS = ((3, 45), (50, 92))
+
+# Рівні zlib для PNG: швидко для превʼю, максимум для архіву
+COMPRESSION_LEVELS = {"fast": 1, "default": 6, "max": 9}
+IMAGE_MODES = ("L", "1", "P")
+
+
+@lru_cache(maxsize=None)
+def load_font(size, face="arial.ttf"):
+    # Шрифти кешуються на весь процес: truetype() читає і розбирає файл щоразу
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(face, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+_GLYPH_PAD = 4  # запас зліва/справа на виступи гліфа за межі advance
+
+
+@lru_cache(maxsize=32)
+def digit_atlas(size, face="arial.ttf"):
+    # Заздалегідь растеризовані цифри 0-9: {цифра: (маска uint8, advance)}
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    font = load_font(size, face)
+    height = font.getbbox("0123456789")[3]
+    atlas = {}
+    for digit in "0123456789":
+        advance = font.getlength(digit)
+        glyph = Image.new('L', (int(advance) + 2 * _GLYPH_PAD, height), 0)
+        ImageDraw.Draw(glyph).text((_GLYPH_PAD, 0), digit, fill=255, font=font)
+        mask = np.asarray(glyph)
+        mask.flags.writeable = False
+        atlas[digit] = (mask, advance)
+    return atlas
+
+
+def draw_digits(canvas, xy, text, atlas):
+    # Вклеює кешовані гліфи в полотно (темний текст на білому) без draw.text
+    import numpy as np
+
+    x, y = xy
+    canvas_h, canvas_w = canvas.shape
+    pen = float(x)
+    for ch in text:
+        mask, advance = atlas[ch]
+        gx = round(pen) - _GLYPH_PAD
+        x0, y0 = max(gx, 0), max(y, 0)
+        x1, y1 = min(gx + mask.shape[1], canvas_w), min(y + mask.shape[0], canvas_h)
+        if x0 < x1 and y0 < y1:
+            region = canvas[y0:y1, x0:x1]
+            np.minimum(region, 255 - mask[y0 - y:y1 - y, x0 - gx:x1 - gx], out=region)
+        pen += advance
+    return canvas
+
+
+def module_width_for_dpi(dpi, x_dim_mm=0.33):
+    # Номінальний модуль EAN-13 — 0.33 мм; менше 1 пікселя не буває
+    return max(1, round(x_dim_mm / 25.4 * dpi))
+
+
+def modules_array(binary):
+    import numpy as np
+
+    if isinstance(binary, str):
+        return np.frombuffer(binary.encode('ascii'), dtype=np.uint8) - ord('0')
+    if isinstance(binary, int):
+        from .encoder import modules_to_bytes
+
+        return np.unpackbits(np.frombuffer(modules_to_bytes(binary), dtype=np.uint8))[:MODULES]
+    return np.asarray(binary, dtype=np.uint8)
+
+
+@lru_cache(maxsize=32)
+def _canvas_template(module_w, h, quiet, text_area):
+    # Біле полотно з уже намальованими охоронними штрихами; для кожного масштабу — один раз
+    import numpy as np
+
+    width = MODULES * module_w + 2 * quiet
+    canvas = np.full((h + text_area, width), 255, dtype=np.uint8)
+    for offset, guard in ((0, START_GUARD), (45, CENTER_GUARD), (92, END_GUARD)):
+        for i, bit in enumerate(guard):
+            if bit == '1':
+                x = quiet + (offset + i) * module_w
+                canvas[TOP_MARGIN:h + 1, x:x + module_w] = 0
+    canvas.flags.writeable = False
+    return canvas
+
+
+def rasterize(binary, module_w=3, h=100, quiet=30, text_area=TEXT_AREA):
+    # Один рядок розгортки з модулів, далі — broadcast на всю висоту штрихів
+    import numpy as np
+
+    modules = modules_array(binary)
+    canvas = _canvas_template(module_w, h, quiet, text_area).copy()
+    for start, end in _DATA_SPANS:
+        line = np.repeat(255 - modules[start:end] * 255, module_w).astype(np.uint8)
+        x0 = quiet + start * module_w
+        canvas[TOP_MARGIN:h + 1, x0:x0 + line.size] = line
+    return canvas
+
+
+def _to_image(canvas, mode, dpi):
+    # 'L' — 8 біт; '1' — 1 біт на піксель; 'P' — 2-кольорова палітра (1 біт у PNG)
+    from PIL import Image
+
+    if mode == 'L':
+        img = Image.fromarray(canvas)
+    elif mode == '1':
+        img = Image.fromarray(canvas >= 128)
+    elif mode == 'P':
+        indices = (canvas >= 128).astype('uint8')
+        img = Image.frombytes('P', (canvas.shape[1], canvas.shape[0]), indices.tobytes())
+        img.putpalette([0, 0, 0, 255, 255, 255])
+    else:
+        raise ValueError(f"Невідомий режим зображення: {mode}")
+    if dpi:
+        img.info['dpi'] = (dpi, dpi)
+    return img
+
+
+def render_bars(binary, module_w=3, h=100, quiet=30, text_area=TEXT_AREA, dpi=None, mode='L'):
+    return _to_image(rasterize(binary, module_w, h, quiet, text_area), mode, dpi)
+
+
+def render_image(full_code, binary, module_w=3, h=100, quiet=30, font_size=22, dpi=None, face="arial.ttf",
+                 mode='L'):
+    if dpi and module_w is None:
+        module_w = module_width_for_dpi(dpi)
+    canvas = rasterize(binary, module_w, h, quiet, TEXT_AREA)
+    atlas = digit_atlas(font_size, face)
+
+    draw_digits(canvas, (quiet - 20, h + 10), full_code[0], atlas)
+    draw_digits(canvas, (quiet + (3 * module_w) + 10, h + 10), full_code[1:7], atlas)
+    draw_digits(canvas, (quiet + (50 * module_w) + 10, h + 10), full_code[7:], atlas)
+
+    return _to_image(canvas, mode, dpi)
+
+
+def save_png(img, fp, compression="default"):
+    # compression — "fast" | "default" | "max" або рівень zlib 0-9
+    level = COMPRESSION_LEVELS.get(compression, compression)
+    if not isinstance(level, int) or not 0 <= level <= 9:
+        raise ValueError(f"Невідомий рівень стиснення: {compression}")
+    params = {"compress_level": level, "optimize": level == 9}
+    if 'dpi' in img.info:
+        params["dpi"] = img.info['dpi']
+    img.save(fp, format="PNG", **params)
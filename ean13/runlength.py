@@ -0,0 +1,151 @@
+# Масштабонезалежне декодування за довжинами серій.
+# Рядок розгортки перетворюється на серії штрих/пробіл; кожна група з 4 серій
+# нормалізується до 7 модулів і шукається в таблиці ширин, побудованій з L/G/R-кодів.
+# Геометрія між символами не використовується, тож перспектива, приріст друку
+# чи зайві темні пікселі в тихій зоні не зсувають сітку.
+
+import numpy as np
+
+from .scan import DEFAULT_SCANLINES, assemble, binarize, scanline_rows, vote
+from .tables import L_CODES, G_CODES, R_CODES, INVALID, SET_L, SET_G, SET_R
+
+RUNS = 59           # 3 + 6*4 + 5 + 6*4 + 3 серій на символ
+MIN_QUIET = 3       # мінімальна тиха зона перед старт-маркером, модулів
+GUARD_TOLERANCE = (0.4, 2.5)  # допустима ширина серії маркера, у модулях
+EDGE_TOLERANCE = (1.5, 5.5)   # допустима відстань між однойменними краями, у модулях (табличні 2..5)
+MIN_AGREEING = 2    # стільки рядків мають прочитати той самий код
+
+_LEFT_GROUPS = 3 + np.arange(24)
+_CENTER_RUNS = np.arange(27, 32)
+_RIGHT_GROUPS = 32 + np.arange(24)
+_GUARD_RUNS = np.concatenate([np.arange(3), _CENTER_RUNS, np.arange(56, 59)])
+
+
+def _widths(code):
+    runs, count = [], 1
+    for a, b in zip(code, code[1:]):
+        if a == b:
+            count += 1
+        else:
+            runs.append(count)
+            count = 1
+    runs.append(count)
+    return runs
+
+
+def _edge_key(runs):
+    # Відстані між однойменними краями (r0+r1, r1+r2) не залежать від приросту друку
+    return (runs[0] + runs[1] - 2) * 4 + (runs[1] + runs[2] - 2)
+
+
+def _width_tables():
+    # Ключ — пара відстаней між краями (2..5 модулів кожна), 16 комірок на бік.
+    # Пари 1/7 і 2/8 мають однаковий ключ, тому в комірці два варіанти
+    # із сумарною шириною штрихів, за якою їх розрізняють.
+    tables = {}
+    for side, groups in (("left", ((L_CODES, SET_L, (1, 3)), (G_CODES, SET_G, (1, 3)))),
+                         ("right", ((R_CODES, SET_R, (0, 2)),))):
+        entries = np.full((16, 2), INVALID, dtype=np.uint8)
+        bars = np.zeros((16, 2))
+        for codes, symbol_set, bar_runs in groups:
+            for digit in range(10):
+                runs = _widths(codes[digit])
+                key = _edge_key(runs)
+                slot = 0 if entries[key, 0] == INVALID else 1
+                entries[key, slot] = symbol_set * 10 + digit
+                bars[key, slot] = runs[bar_runs[0]] + runs[bar_runs[1]]
+        single = entries[:, 1] == INVALID
+        entries[single, 1] = entries[single, 0]
+        bars[single, 1] = bars[single, 0]
+        tables[side] = (entries, bars, bar_runs)
+    return tables["left"], tables["right"]
+
+
+LEFT_WIDTHS, RIGHT_WIDTHS = _width_tables()
+
+
+def row_runs(dark_row):
+    # (довжини серій, колір кожної серії, x початку кожної серії)
+    change = np.flatnonzero(dark_row[1:] != dark_row[:-1]) + 1
+    edges = np.concatenate([[0], change, [dark_row.size]])
+    return np.diff(edges), dark_row[edges[:-1]], edges[:-1]
+
+
+def match_groups(groups, table):
+    # C×6×4 ширин серій -> C×6 записів таблиці символів
+    entries, bars, bar_runs = table
+    # Групи з відстанями поза EDGE_TOLERANCE — не символ, а шум: вони отримують INVALID
+    scale = 7.0 / groups.sum(axis=-1)
+    e1 = (groups[..., 0] + groups[..., 1]) * scale
+    e2 = (groups[..., 1] + groups[..., 2]) * scale
+    in_range = ((e1 >= EDGE_TOLERANCE[0]) & (e1 <= EDGE_TOLERANCE[1])
+                & (e2 >= EDGE_TOLERANCE[0]) & (e2 <= EDGE_TOLERANCE[1]))
+    t1 = np.clip(np.rint(e1), 2, 5).astype(np.intp)
+    t2 = np.clip(np.rint(e2), 2, 5).astype(np.intp)
+    key = (t1 - 2) * 4 + (t2 - 2)
+    measured = (groups[..., bar_runs[0]] + groups[..., bar_runs[1]]) * scale
+    slot = np.abs(measured[..., None] - bars[key]).argmin(axis=-1)
+    matched = np.take_along_axis(entries[key], slot[..., None], -1)[..., 0]
+    return np.where(in_range, matched, INVALID).astype(np.uint8)
+
+
+def candidate_entries(lengths, colors):
+    # Для кожної темної серії, з якої може початися символ, — 12 записів таблиці символів
+    starts = np.flatnonzero(colors[:lengths.size - RUNS + 1]) if lengths.size >= RUNS else np.empty(0, np.intp)
+    if starts.size == 0:
+        return starts, np.empty((0, 12), dtype=np.uint8)
+    widths = lengths[starts[:, None] + np.arange(RUNS)].astype(np.float64)
+    module = widths.sum(axis=1) / 95.0
+
+    guards = widths[:, _GUARD_RUNS] / module[:, None]
+    ok = ((guards >= GUARD_TOLERANCE[0]) & (guards <= GUARD_TOLERANCE[1])).all(axis=1)
+    quiet = np.where(starts > 0, lengths[np.maximum(starts - 1, 0)], np.inf)
+    ok &= quiet >= MIN_QUIET * module
+
+    entries = np.concatenate([match_groups(widths[:, _LEFT_GROUPS].reshape(-1, 6, 4), LEFT_WIDTHS),
+                              match_groups(widths[:, _RIGHT_GROUPS].reshape(-1, 6, 4), RIGHT_WIDTHS)], axis=1)
+    ok &= (entries != INVALID).all(axis=1)
+    return starts[ok], entries[ok]
+
+
+def decode_row(dark_row):
+    # Перший кандидат у рядку, що проходить перевірку парності та контрольної цифри
+    lengths, colors, _ = row_runs(dark_row)
+    _, entries = candidate_entries(lengths, colors)
+    for row_entries in entries:
+        try:
+            assemble(row_entries)
+        except ValueError:
+            continue
+        return row_entries
+    return None
+
+
+def _vote_rows(dark, required):
+    # (переможці, їх підтримка, кількість рядків), якщо щонайменше required рядків дали той самий код
+    found = [entries for entries in map(decode_row, dark) if entries is not None]
+    if len(found) < required:
+        return None
+    found = np.array(found)
+    winners, support = vote(found)
+    # Один випадковий рядок, що пройшов контрольну цифру на шумі, — ще не прочитання
+    if (found == winners).all(axis=1).sum() < required:
+        return None
+    return winners, support, len(found)
+
+
+def decode_lines(lines, binarizer=binarize):
+    dark = binarizer(lines)
+    required = min(MIN_AGREEING, len(lines))
+    # Якщо не вийшло, можливо, штрих-код перевернутий на 180°
+    voted = _vote_rows(dark, required) or _vote_rows(dark[:, ::-1], required)
+    if voted is None:
+        raise ValueError("Штрих-код не знайдено за довжинами серій")
+    winners, support, rows = voted
+    # Впевненість — частка всіх рядків, а не лише тих, де знайшовся кандидат
+    return assemble(winners), float(support.min()) * rows / len(lines)
+
+
+def decode_gray(gray, scanlines=DEFAULT_SCANLINES, binarizer=binarize):
+    rows = scanline_rows(gray.shape[0], scanlines)
+    return decode_lines(gray[rows], binarizer)
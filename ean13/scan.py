@@ -0,0 +1,177 @@
+# Векторизоване декодування: зображення завантажується в масив один раз,
+# K рядків розгортки бінаризуються й декодуються разом, а результати
+# обʼєднуються голосуванням більшості окремо для кожного символу.
+
+import numpy as np
+
+from .encoder import calculate_check_digit
+from .tables import MODULES, SYMBOL_DECODE, PARITY_DECODE, INVALID, SET_G, SET_R
+
+DEFAULT_SCANLINES = 15
+SCAN_BAND = (0.25, 0.65)  # частка висоти, з якої беруться рядки (над цифрами під штрихами)
+SINGLE_ROWS = (0.5, 0.35)  # рядки швидкого шляху decode_single, частки висоти
+
+_SYMBOL_TABLE = np.frombuffer(SYMBOL_DECODE, dtype=np.uint8)
+_WEIGHTS = 1 << np.arange(6, -1, -1)
+_START = np.array([1, 0, 1], dtype=bool)
+_SAMPLE_OFFSETS = np.arange(MODULES) + 0.5
+_ZERO = ord('0')
+
+
+def load_gray(filepath):
+    from PIL import Image
+
+    with Image.open(filepath) as img:
+        return np.asarray(img.convert('L'))
+
+
+def scanline_rows(height, scanlines=DEFAULT_SCANLINES, band=SCAN_BAND):
+    if scanlines <= 1:
+        return np.array([height // 2])
+    top, bottom = int(height * band[0]), int(height * band[1])
+    return np.unique(np.linspace(top, max(top, bottom - 1), scanlines).astype(np.intp))
+
+
+def binarize(lines):
+    # Поріг — середина між найтемнішим і найсвітлішим пікселем кожного рядка
+    lo = lines.min(axis=1, keepdims=True).astype(np.int16)
+    hi = lines.max(axis=1, keepdims=True).astype(np.int16)
+    dark = lines < (lo + hi + 1) // 2
+    dark[(hi - lo).ravel() < 32] = False  # рядок без контрасту — штрихів немає
+    return dark
+
+
+def otsu_binarize(lines):
+    # Поріг Оцу для кожного рядка окремо: максимум міжкласової дисперсії гістограми
+    k = len(lines)
+    offsets = (np.arange(k) * 256)[:, None]
+    hist = np.bincount((lines.astype(np.intp) + offsets).ravel(), minlength=k * 256).reshape(k, 256)
+    levels = np.arange(256)
+    # У float64: квадрат різниці в int64 переповнюється вже на рядках у ~20000 пікселів
+    weight = hist.cumsum(axis=1).astype(np.float64)
+    mass = (hist * levels).cumsum(axis=1).astype(np.float64)
+    total, total_mass = weight[:, -1:], mass[:, -1:]
+    background = total - weight
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = (total_mass * weight - mass * total) ** 2 / (weight * background)
+    between = np.nan_to_num(between, nan=0.0, posinf=0.0)
+    threshold = between.argmax(axis=1)[:, None]
+    dark = lines <= threshold
+    dark[(lines.max(axis=1) - lines.min(axis=1).astype(np.int16)) < 32] = False
+    return dark
+
+
+def local_binarize(lines, window=None, ratio=0.9):
+    # Адаптивний поріг: піксель темний, якщо він темніший за ratio × середнє в ковзному вікні.
+    # Допомагає при нерівномірному освітленні, коли один глобальний поріг не підходить.
+    k, width = lines.shape
+    window = window or max(15, width // 16) | 1
+    half = window // 2
+    padded = np.pad(lines.astype(np.float64), ((0, 0), (half + 1, half)), mode='edge')
+    sums = padded.cumsum(axis=1)
+    mean = (sums[:, window:] - sums[:, :-window]) / window
+    return lines < mean[:, :width] * ratio
+
+
+def sample_modules(dark):
+    # K×W бінарних рядків -> K×95 модулів; рівномірна сітка між першим і останнім темним пікселем
+    k, width = dark.shape
+    found = dark.any(axis=1)
+    start = dark.argmax(axis=1)
+    end = width - 1 - dark[:, ::-1].argmax(axis=1)
+    module = (end - start + 1) / MODULES
+    x = start[:, None] + _SAMPLE_OFFSETS * module[:, None]
+    x = np.clip(x.astype(np.intp), 0, width - 1)
+    bits = np.take_along_axis(dark, x, axis=1)
+    return bits, found
+
+
+def symbol_entries(bits):
+    # K×95 модулів -> K×12 записів SYMBOL_DECODE (набір * 10 + цифра або INVALID)
+    k = len(bits)
+    left = bits[:, 3:45].reshape(k, 6, 7) @ _WEIGHTS
+    right = bits[:, 50:92].reshape(k, 6, 7) @ _WEIGHTS
+    entries = _SYMBOL_TABLE[np.concatenate([left, right], axis=1)]
+    guards = (bits[:, :3] == _START).all(axis=1) & (bits[:, -3:] == _START).all(axis=1)
+    # Праворуч можуть бути лише R-символи, ліворуч — лише L/G
+    wrong_side = np.zeros_like(entries, dtype=bool)
+    wrong_side[:, :6] = entries[:, :6] >= SET_R * 10
+    wrong_side[:, 6:] = entries[:, 6:] < SET_R * 10
+    entries[wrong_side] = INVALID
+    entries[~guards] = INVALID
+    return entries
+
+
+def vote(entries):
+    # Для кожної з 12 позицій — найчастіший дійсний запис і частка рядків, що його підтримали
+    k = len(entries)
+    valid = entries != INVALID
+    cols = np.broadcast_to(np.arange(12) * 31, entries.shape)
+    counts = np.bincount((cols + entries)[valid], minlength=12 * 31).reshape(12, 31)
+    winners = counts.argmax(axis=1)
+    support = counts.max(axis=1) / max(k, 1)
+    winners[support == 0] = INVALID
+    return winners, support
+
+
+def assemble(winners):
+    if (winners == INVALID).any():
+        raise ValueError("Помилка читання (шум): не вдалося розпізнати всі символи")
+    parity = 0
+    for entry in winners[:6]:
+        parity = (parity << 1) | int(entry >= SET_G * 10)
+    first_digit = PARITY_DECODE[parity]
+    if first_digit == INVALID:
+        raise ValueError(f"Невідомий шаблон парності: {parity:06b}")
+    digits = bytes([_ZERO + first_digit] + [_ZERO + int(e) % 10 for e in winners])
+    full_code = digits.decode('ascii')
+    if calculate_check_digit(full_code) != ord(full_code[12]) - _ZERO:
+        raise ValueError(f"Невірна контрольна цифра: {full_code}")
+    return full_code
+
+
+def decode_lines(lines, binarizer=binarize):
+    # lines — K×W масив відтінків сірого; повертає (код, впевненість 0..1)
+    bits, found = sample_modules(binarizer(lines))
+    if not found.any():
+        raise ValueError("Штрих-код не знайдено (немає чорних пікселів)")
+    winners, support = vote(symbol_entries(bits))
+    return assemble(winners), float(support.min())
+
+
+def _decode_single_row(line):
+    from .decoder import decode_modules
+
+    lo, hi = int(line.min()), int(line.max())
+    if hi - lo < 32:
+        raise ValueError("Штрих-код не знайдено (немає чорних пікселів)")
+    dark = line < (lo + hi + 1) // 2
+    xs = np.flatnonzero(dark)
+    start, end = int(xs[0]), int(xs[-1])
+    module = (end - start + 1) / MODULES
+    bits = dark[(start + (_SAMPLE_OFFSETS * module)).astype(np.intp)]
+    value = int.from_bytes(np.packbits(bits).tobytes(), 'big') >> 1
+    return decode_modules(value)
+
+
+def decode_single(gray, rows=None):
+    # Найдешевший шлях: два рядки по 95 вибірок, далі — цілочисельні таблиці decode_modules.
+    # Впевненість — частка рядків, що прочитали той самий код; один рядок на шумі дає 0.5.
+    if rows is None:
+        rows = [int(gray.shape[0] * fraction) for fraction in SINGLE_ROWS]
+    codes = []
+    error = None
+    for row in rows:
+        try:
+            codes.append(_decode_single_row(gray[row]))
+        except ValueError as e:
+            error = e
+    if not codes:
+        raise error
+    code = max(set(codes), key=codes.count)
+    return code, codes.count(code) / len(rows)
+
+
+def decode_gray(gray, scanlines=DEFAULT_SCANLINES, binarizer=binarize):
+    rows = scanline_rows(gray.shape[0], scanlines)
+    return decode_lines(gray[rows], binarizer)
@@ -0,0 +1,173 @@
+# Декодування безперервного потоку кадрів (камера над конвеєром).
+# Кадри — сирі 8-бітні відтінки сірого фіксованого розміру з файлу чи каналу,
+# наприклад: ffmpeg -i camera.mp4 -f rawvideo -pix_fmt gray - | python -m ean13.stream - --size 640x480
+#
+# Щоб не декодувати кожен кадр заново:
+#  * запамʼятовується остання ділянка зі штрих-кодом, і наступні кадри декодуються лише в ній;
+#  * кадр пропускається, якщо проріджена сітка пікселів усього кадру ніде помітно не змінилася;
+#  * той самий код, прочитаний повторно в межах часового вікна, не видається вдруге.
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from . import runlength
+from .locate import crop_region, locate
+from .scan import DEFAULT_SCANLINES
+
+SIGNATURE_STEP = 4        # відбиток кадру — кожен 4-й піксель кожного 4-го рядка
+SIGNATURE_CELL = 16       # відбиток ділиться на клітинки 16×16 відліків (64×64 пікселі кадру)
+CHANGE_THRESHOLD = 2.0    # середня зміна яскравості в найзмінішій клітинці, нижче — той самий кадр
+DEDUPE_WINDOW = 2.0       # с
+ROI_MISSES = 5            # стільки невдач поспіль у ділянці — і ділянка скидається
+
+
+def read_raw_frames(fp, width, height):
+    # Читає кадри в один і той самий буфер: споживач не повинен зберігати масив між кадрами
+    frame_size = width * height
+    buffer = bytearray(frame_size)
+    view = memoryview(buffer)
+    gray = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width)
+    while True:
+        filled = 0
+        while filled < frame_size:
+            n = fp.readinto(view[filled:])
+            if not n:
+                return
+            filled += n
+        yield gray
+
+
+class StreamDecoder:
+    def __init__(self, scanlines=DEFAULT_SCANLINES, dedupe_window=DEDUPE_WINDOW,
+                 change_threshold=CHANGE_THRESHOLD):
+        self.scanlines = scanlines
+        self.dedupe_window = dedupe_window
+        self.change_threshold = change_threshold
+        self.roi = None
+        self.roi_misses = 0
+        self.last_seen = {}
+        self._signature = None
+        self.frames = 0
+        self.skipped = 0
+        self.decoded = 0
+        self.emitted = 0
+
+    def _signature_of(self, gray):
+        # Сітка по всьому кадру: locate() шукає всюди, тож і зміни треба помічати всюди
+        return gray[::SIGNATURE_STEP, ::SIGNATURE_STEP].astype(np.int16)
+
+    def _unchanged(self, gray):
+        signature = self._signature_of(gray)
+        previous, self._signature = self._signature, signature
+        if previous is None or previous.shape != signature.shape:
+            return False
+        # Максимум по клітинках, а не середнє по кадру: малий штрих-код у куті
+        # інакше розчиняється в незмінному фоні
+        diff = np.abs(signature - previous)
+        starts_y = np.arange(0, diff.shape[0], SIGNATURE_CELL)
+        starts_x = np.arange(0, diff.shape[1], SIGNATURE_CELL)
+        sums = np.add.reduceat(np.add.reduceat(diff, starts_y, axis=0), starts_x, axis=1)
+        counts = np.outer(np.diff(np.append(starts_y, diff.shape[0])), np.diff(np.append(starts_x, diff.shape[1])))
+        return float((sums / counts).max()) < self.change_threshold
+
+    def _decode(self, gray):
+        # (код, впевненість) або None; спершу — відома ділянка, потім — пошук по кадру
+        if self.roi is not None:
+            try:
+                result = runlength.decode_gray(crop_region(gray, self.roi), self.scanlines)
+                self.roi_misses = 0
+                return result
+            except ValueError:
+                self.roi_misses += 1
+                if self.roi_misses < ROI_MISSES:
+                    return None
+                self.roi = None
+        for region in locate(gray):
+            try:
+                result = runlength.decode_gray(crop_region(gray, region), self.scanlines)
+            except ValueError:
+                continue
+            self.roi = region
+            self.roi_misses = 0
+            return result
+        return None
+
+    def process(self, gray, timestamp=None):
+        # Повертає (код, впевненість) лише для нового прочитання, інакше None
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        self.frames += 1
+        if self._unchanged(gray):
+            self.skipped += 1
+            return None
+        result = self._decode(gray)
+        if result is None:
+            return None
+        self.decoded += 1
+        code, confidence = result
+        last = self.last_seen.get(code)
+        self.last_seen[code] = timestamp
+        if last is not None and timestamp - last < self.dedupe_window:
+            return None
+        self._expire(timestamp)
+        self.emitted += 1
+        return code, confidence
+
+    def _expire(self, now):
+        stale = [code for code, seen in self.last_seen.items() if now - seen >= self.dedupe_window]
+        for code in stale:
+            del self.last_seen[code]
+
+    def stats(self):
+        return {"frames": self.frames, "skipped": self.skipped, "decoded": self.decoded,
+                "emitted": self.emitted, "roi": tuple(self.roi.box) if self.roi else None}
+
+
+def _parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Декодування EAN-13 з потоку сирих кадрів")
+    parser.add_argument("source", help="файл із сирими кадрами (gray8) або '-' для stdin")
+    parser.add_argument("--size", type=_parse_size, required=True, help="розмір кадру, напр. 640x480")
+    parser.add_argument("--fps", type=float, default=None,
+                        help="частота кадрів для міток часу; без неї — реальний час")
+    parser.add_argument("--window", type=float, default=DEDUPE_WINDOW, help="вікно дедуплікації, с")
+    parser.add_argument("--scanlines", type=int, default=DEFAULT_SCANLINES)
+    args = parser.parse_args(argv)
+
+    width, height = args.size
+    fp = sys.stdin.buffer if args.source == "-" else open(args.source, "rb")
+    decoder = StreamDecoder(args.scanlines, args.window)
+    started = time.perf_counter()
+    try:
+        for index, gray in enumerate(read_raw_frames(fp, width, height)):
+            timestamp = index / args.fps if args.fps else None
+            result = decoder.process(gray, timestamp)
+            if result is not None:
+                code, confidence = result
+                record = {"frame": index, "time": round(timestamp if timestamp is not None else
+                                                         time.perf_counter() - started, 3),
+                          "code": code, "confidence": round(confidence, 3)}
+                sys.stdout.write(json.dumps(record) + "\n")
+                sys.stdout.flush()
+    finally:
+        if fp is not sys.stdin.buffer:
+            fp.close()
+
+    elapsed = time.perf_counter() - started
+    stats = decoder.stats()
+    fps = stats["frames"] / elapsed if elapsed else 0.0
+    print(f"Кадрів: {stats['frames']}, пропущено без змін: {stats['skipped']}, "
+          f"розпізнано: {stats['decoded']}, нових кодів: {stats['emitted']} ({fps:.0f} кадрів/с)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# Таблиці символіки EAN-13 (ГОСТ / ISO/IEC 15420)
+
+L_CODES = ["0001101", "0011001", "0010011", "0111101", "0100011",
+           "0110001", "0101111", "0111011", "0110111", "0001011"]
+
+G_CODES = ["0100111", "0110011", "0011011", "0100001", "0011101",
+           "0111001", "0000101", "0010001", "0001001", "0010111"]
+
+R_CODES = ["1110010", "1100110", "1101100", "1000010", "1011100",
+           "1001110", "1010000", "1000100", "1001000", "1110100"]
+
+PARITY_PATTERNS = ["LLLLLL", "LLGLGG", "LLGGLG", "LLGGGL", "LGLLGG",
+                   "LGGLLG", "LGGGLL", "LGLGLG", "LGLGGL", "LGGLGL"]
+
+START_GUARD = "101"
+CENTER_GUARD = "01010"
+END_GUARD = "101"
+
+MODULES = 95
+
+# Цілочисельне подання: кожен символ — 7-бітне число (старший біт = лівий модуль),
+# весь штрих-код — 95-бітне число або 12 байт (як np.packbits, останній біт — доповнення).
+L_VALUES = [int(code, 2) for code in L_CODES]
+G_VALUES = [int(code, 2) for code in G_CODES]
+R_VALUES = [int(code, 2) for code in R_CODES]
+
+START_VALUE = int(START_GUARD, 2)
+CENTER_VALUE = int(CENTER_GUARD, 2)
+END_VALUE = int(END_GUARD, 2)
+
+# Маска парності лівої половини: біт 1 = набір G, старший біт — перша позиція
+PARITY_MASKS = [int(pattern.replace("L", "0").replace("G", "1"), 2) for pattern in PARITY_PATTERNS]
+
+SET_L, SET_G, SET_R = 0, 1, 2
+INVALID = 0xFF
+
+
+def _symbol_decode_table():
+    table = bytearray([INVALID] * 128)
+    for digit in range(10):
+        table[L_VALUES[digit]] = SET_L * 10 + digit
+        table[G_VALUES[digit]] = SET_G * 10 + digit
+        table[R_VALUES[digit]] = SET_R * 10 + digit
+    return bytes(table)
+
+
+def _parity_decode_table():
+    table = bytearray([INVALID] * 64)
+    for digit, mask in enumerate(PARITY_MASKS):
+        table[mask] = digit
+    return bytes(table)
+
+
+# SYMBOL_DECODE[7-бітний символ] -> набір * 10 + цифра, або INVALID
+SYMBOL_DECODE = _symbol_decode_table()
+# PARITY_DECODE[6-бітна маска парності] -> перша цифра, або INVALID
+PARITY_DECODE = _parity_decode_table()
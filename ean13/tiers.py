@@ -0,0 +1,88 @@
+# Ступеневе декодування: спершу найдешевший шлях (два рядки розгортки),
+# і лише якщо він не пройшов перевірку маркерів, парності, контрольної цифри чи порогу впевненості —
+# дорожчі ступені: більше рядків, довжини серій, поріг Оцу, локальний поріг, поворот.
+# Кожна спроба фіксує свою впевненість і витрачений час.
+
+import time
+from collections import namedtuple
+
+from . import runlength, scan
+from .locate import crop_region, locate_levels
+
+TierAttempt = namedtuple("TierAttempt", ["tier", "code", "confidence", "elapsed", "error"])
+TieredResult = namedtuple("TieredResult", ["code", "confidence", "tier", "elapsed", "attempts"])
+
+
+def _single(gray, scanlines):
+    return scan.decode_single(gray)
+
+
+def _multi(gray, scanlines):
+    return scan.decode_gray(gray, scanlines)
+
+
+def _runs(gray, scanlines):
+    return runlength.decode_gray(gray, scanlines)
+
+
+def _otsu(gray, scanlines):
+    try:
+        return scan.decode_gray(gray, scanlines, scan.otsu_binarize)
+    except ValueError:
+        return runlength.decode_gray(gray, scanlines, scan.otsu_binarize)
+
+
+def _local(gray, scanlines):
+    return runlength.decode_gray(gray, scanlines, scan.local_binarize)
+
+
+def _rotate(gray, scanlines):
+    for regions in locate_levels(gray):
+        for region in regions:
+            crop = crop_region(gray, region)
+            for binarizer in (scan.binarize, scan.local_binarize):
+                try:
+                    return runlength.decode_gray(crop, scanlines, binarizer)
+                except ValueError:
+                    continue
+    raise ValueError("Штрих-код не знайдено навіть після пошуку й повороту")
+
+
+# Від найдешевшого до найдорожчого
+TIERS = (
+    ("single", _single),
+    ("multi", _multi),
+    ("runs", _runs),
+    ("otsu", _otsu),
+    ("local", _local),
+    ("rotate", _rotate),
+)
+TIER_NAMES = tuple(name for name, _ in TIERS)
+
+# Нижче цього код вважається випадковим збігом на шумі: один-два рядки з 15, що пройшли контрольну цифру
+MIN_CONFIDENCE = 0.3
+
+
+def decode_tiered(gray, scanlines=scan.DEFAULT_SCANLINES, tiers=None, min_confidence=MIN_CONFIDENCE):
+    # Повертає TieredResult; code = None, якщо жоден ступінь не впорався.
+    # Прочитання з впевненістю нижче min_confidence змушує йти далі, а якщо кращого
+    # не знайшлося — не повертається (лишається в attempts); 0.0 приймає будь-яке.
+    if min_confidence is None:
+        min_confidence = MIN_CONFIDENCE
+    selected = [t for t in TIERS if tiers is None or t[0] in tiers]
+    attempts = []
+    started = time.perf_counter()
+    for name, tier in selected:
+        t0 = time.perf_counter()
+        try:
+            code, confidence = tier(gray, scanlines)
+        except ValueError as e:
+            attempts.append(TierAttempt(name, None, 0.0, time.perf_counter() - t0, str(e)))
+            continue
+        if confidence < min_confidence:
+            attempts.append(TierAttempt(name, code, confidence, time.perf_counter() - t0,
+                                        f"Впевненість {confidence:.2f} нижче порогу {min_confidence:.2f}"))
+            continue
+        attempts.append(TierAttempt(name, code, confidence, time.perf_counter() - t0, None))
+        return TieredResult(code, confidence, name, time.perf_counter() - started, attempts)
+    return TieredResult(None, 0.0, None, time.perf_counter() - started, attempts)
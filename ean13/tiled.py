@@ -0,0 +1,118 @@
+# Паралельне декодування дуже великих сканів (сотні мегапікселів).
+# Зображення один раз завантажується у спільну памʼять; воркери приєднуються до неї
+# і працюють із перекривними плитками як із представленнями масиву, без копіювання.
+# Штрих-коди в зоні перекриття знаходяться двічі й обʼєднуються.
+#
+#   python -m ean13.tiled sheet_600dpi.png --tile 2048 --overlap 512
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .multi import decode_all, merge_detections
+from .scan import DEFAULT_SCANLINES
+
+DEFAULT_TILE = 2048
+DEFAULT_OVERLAP = 512   # має бути більшим за найбільший штрих-код, інакше він розріжеться в обох плитках
+MAX_PIXELS = 2_000_000_000  # замість захисту PIL від «бомб» (~179 Мп), лише на час load_shared
+STRIP_ROWS = 256  # load_shared переносить зображення в спільну памʼять смугами по стільки рядків
+
+_shared = None
+_image = None
+
+
+def tile_boxes(height, width, tile=DEFAULT_TILE, overlap=DEFAULT_OVERLAP):
+    if overlap >= tile:
+        raise ValueError("Перекриття має бути меншим за розмір плитки")
+    step = tile - overlap
+    ys = list(range(0, max(height - overlap, 1), step))
+    xs = list(range(0, max(width - overlap, 1), step))
+    return [(x, y, min(x + tile, width), min(y + tile, height)) for y in ys for x in xs]
+
+
+def _init_worker(name, shape):
+    # Воркер лише читає сегмент; звільняє його (unlink) головний процес
+    global _shared, _image
+    _shared = shared_memory.SharedMemory(name=name)
+    _image = np.ndarray(shape, dtype=np.uint8, buffer=_shared.buf)
+    _image.flags.writeable = False
+
+
+def _decode_tile(box, scanlines, method):
+    left, top, right, bottom = box
+    found = decode_all(_image[top:bottom, left:right], scanlines, method)
+    return [d._replace(box=(d.box[0] + left, d.box[1] + top, d.box[2] + left, d.box[3] + top)) for d in found]
+
+
+def load_shared(filepath):
+    # PIL декодує файл цілком, а в сегмент спільної памʼяті він переноситься смугами:
+    # повнорозмірних копій (відтінки сірого, масив) поряд із декодованим зображенням немає.
+    # Повертає (сегмент, масив-представлення)
+    from PIL import Image
+
+    limit, Image.MAX_IMAGE_PIXELS = Image.MAX_IMAGE_PIXELS, MAX_PIXELS
+    try:
+        with Image.open(filepath) as img:
+            width, height = img.size
+            shm = shared_memory.SharedMemory(create=True, size=max(1, width * height))
+            image = np.ndarray((height, width), dtype=np.uint8, buffer=shm.buf)
+            for y in range(0, height, STRIP_ROWS):
+                strip = img.crop((0, y, width, min(y + STRIP_ROWS, height)))
+                image[y:y + strip.height] = np.asarray(strip.convert('L') if strip.mode != 'L' else strip)
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+    return shm, image
+
+
+def decode_large(source, tile=DEFAULT_TILE, overlap=DEFAULT_OVERLAP, workers=None,
+                 scanlines=DEFAULT_SCANLINES, method="runs"):
+    # source — шлях до файлу або 2-вимірний масив uint8; повертає список Detection
+    if isinstance(source, np.ndarray):
+        shm = shared_memory.SharedMemory(create=True, size=max(1, source.size))
+        image = np.ndarray(source.shape, dtype=np.uint8, buffer=shm.buf)
+        image[...] = source
+    else:
+        shm, image = load_shared(source)
+    try:
+        boxes = tile_boxes(image.shape[0], image.shape[1], tile, overlap)
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(boxes) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, image.shape)) as pool:
+            found = [d for tile_found in pool.map(_decode_tile, boxes, [scanlines] * len(boxes),
+                                                  [method] * len(boxes), chunksize=chunksize)
+                     for d in tile_found]
+        return merge_detections(found)
+    finally:
+        del image
+        shm.close()
+        shm.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Декодування всіх EAN-13 на дуже великому скані плитками")
+    parser.add_argument("image")
+    parser.add_argument("--tile", type=int, default=DEFAULT_TILE)
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--method", choices=("grid", "runs"), default="runs")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    detections = decode_large(args.image, args.tile, args.overlap, args.workers, method=args.method)
+    for d in detections:
+        print(json.dumps({"code": d.code, "box": list(d.box), "confidence": round(d.confidence, 3),
+                          "angle": round(d.angle, 2)}))
+    print(f"Знайдено {len(detections)} штрих-кодів за {time.perf_counter() - started:.2f} с",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
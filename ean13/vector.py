@@ -0,0 +1,158 @@
+# Векторний вивід (SVG, PDF, ZPL) прямо з шаблону модулів, без растру та PNG.
+# Кожен темний відрізок модулів стає одним прямокутником.
+
+import re
+
+from .encoder import modules_to_string
+from .tables import MODULES
+
+QUIET = 10          # тиха зона, модулів (як 30 px / 3 px у растровому рендері)
+BAR_HEIGHT = 69.24  # висота штрихів, модулів (22.85 мм при X = 0.33 мм)
+TEXT_HEIGHT = 9     # висота рядка цифр, модулів
+X_DIM_MM = 0.33
+
+_RUN = re.compile('1+')
+_PT_PER_MM = 72 / 25.4
+
+
+def bar_runs(binary):
+    # [(перший модуль, ширина в модулях), ...] для всіх темних відрізків
+    if isinstance(binary, int):
+        binary = modules_to_string(binary)
+    return [(m.start(), m.end() - m.start()) for m in _RUN.finditer(binary)]
+
+
+def _num(value):
+    return f"{value:.3f}".rstrip('0').rstrip('.')
+
+
+def _text_positions(full_code, quiet):
+    # (x центру в модулях, текст): перша цифра зліва від старт-маркера, далі дві половини
+    return [(quiet - 4, full_code[0]),
+            (quiet + 24, full_code[1:7]),
+            (quiet + 71, full_code[7:])]
+
+
+def svg_document(full_code, binary, x_dim_mm=X_DIM_MM, quiet=QUIET, bar_height=BAR_HEIGHT, text=True):
+    width = MODULES + 2 * quiet
+    height = bar_height + (TEXT_HEIGHT if text else 0)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(width * x_dim_mm)}mm" '
+        f'height="{_num(height * x_dim_mm)}mm" viewBox="0 0 {width} {_num(height)}">',
+        f'<rect width="{width}" height="{_num(height)}" fill="#fff"/>',
+    ]
+    bars = "".join(f'M{quiet + x} 0h{w}v{_num(bar_height)}h-{w}z' for x, w in bar_runs(binary))
+    parts.append(f'<path d="{bars}"/>')
+    if text:
+        parts.append(f'<g font-family="Arial,Helvetica,sans-serif" font-size="{TEXT_HEIGHT - 1}" '
+                     f'text-anchor="middle">')
+        for x, digits in _text_positions(full_code, quiet):
+            parts.append(f'<text x="{x}" y="{_num(height - 1)}">{digits}</text>')
+        parts.append('</g>')
+    parts.append('</svg>\n')
+    return "\n".join(parts)
+
+
+def write_svg(fp, full_code, binary, **options):
+    fp.write(svg_document(full_code, binary, **options))
+
+
+def pdf_barcode_ops(full_code, binary, x=0.0, y=0.0, x_dim_mm=X_DIM_MM, quiet=QUIET,
+                    bar_height=BAR_HEIGHT, text=True):
+    # Оператори content stream для однієї етикетки; (x, y) — лівий нижній кут у пунктах
+    m = x_dim_mm * _PT_PER_MM
+    base = y + (TEXT_HEIGHT * m if text else 0)
+    ops = ["0 g"]
+    ops.extend(f"{_num(x + (quiet + start) * m)} {_num(base)} {_num(w * m)} {_num(bar_height * m)} re"
+               for start, w in bar_runs(binary))
+    ops.append("f")
+    if text:
+        size = (TEXT_HEIGHT - 1) * m
+        for cx, digits in _text_positions(full_code, quiet):
+            # Helvetica: ширина цифри — 0.556 кегля
+            tx = x + cx * m - len(digits) * 0.556 * size / 2
+            ops.append(f"BT /F1 {_num(size)} Tf {_num(tx)} {_num(y + m)} Td ({digits}) Tj ET")
+    return ("\n".join(ops) + "\n").encode('ascii')
+
+
+def pdf_label_size(x_dim_mm=X_DIM_MM, quiet=QUIET, bar_height=BAR_HEIGHT, text=True):
+    m = x_dim_mm * _PT_PER_MM
+    return (MODULES + 2 * quiet) * m, (bar_height + (TEXT_HEIGHT if text else 0)) * m
+
+
+class PdfWriter:
+    # Потоковий багатосторінковий PDF: сторінки пишуться одразу, в пам'яті — лише зсуви об'єктів
+    def __init__(self, fp):
+        self.fp = fp
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 4  # 1 — Catalog, 2 — Pages, 3 — шрифт
+        self.pos = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    def _write(self, data):
+        self.fp.write(data)
+        self.pos += len(data)
+
+    def _object(self, obj_id, body):
+        self.offsets[obj_id] = self.pos
+        self._write(b"%d 0 obj\n" % obj_id + body + b"\nendobj\n")
+
+    def add_page(self, width, height, content):
+        page_id, content_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self._object(content_id, b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        self._object(page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(width)} {_num(height)}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode('ascii'))
+        self.page_ids.append(page_id)
+
+    def close(self):
+        kids = " ".join(f"{i} 0 R" for i in self.page_ids)
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode('ascii'))
+        xref_pos = self.pos
+        size = self.next_id
+        lines = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        for obj_id in range(1, size):
+            lines.append(b"%010d 00000 n \n" % self.offsets[obj_id])
+        self._write(b"".join(lines))
+        self._write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_pos))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def write_pdf(fp, full_code, binary, x_dim_mm=X_DIM_MM, quiet=QUIET, bar_height=BAR_HEIGHT, text=True):
+    width, height = pdf_label_size(x_dim_mm, quiet, bar_height, text)
+    with PdfWriter(fp) as pdf:
+        pdf.add_page(width, height, pdf_barcode_ops(full_code, binary, 0, 0, x_dim_mm, quiet, bar_height, text))
+
+
+def zpl_label(full_code, binary, dots_per_module=3, bar_height=100, quiet=QUIET, text=True, x=0, y=0):
+    # Кожен штрих — заповнений ^GB (товщина рамки = ширині), цифри — шрифтом принтера ^A0
+    left = x + quiet * dots_per_module
+    lines = ["^XA"]
+    for start, w in bar_runs(binary):
+        width = w * dots_per_module
+        lines.append(f"^FO{left + start * dots_per_module},{y}^GB{width},{bar_height},{width}^FS")
+    if text:
+        size = TEXT_HEIGHT * dots_per_module
+        for cx, digits in _text_positions(full_code, quiet):
+            fx = x + round((cx - len(digits) * TEXT_HEIGHT * 0.3) * dots_per_module)
+            lines.append(f"^FO{max(fx, 0)},{y + bar_height + dots_per_module}^A0N,{size},{size}^FD{digits}^FS")
+    lines.append("^XZ\n")
+    return "\n".join(lines)
+
+
+def write_zpl(fp, full_code, binary, **options):
+    fp.write(zpl_label(full_code, binary, **options))
+
+
+WRITERS = {"svg": write_svg, "pdf": write_pdf, "zpl": write_zpl}
+BINARY_FORMATS = {"pdf"}
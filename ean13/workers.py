@@ -0,0 +1,157 @@
+# Фонові задачі для GUI: пул потоків для БД і файлового вводу-виводу, пул процесів для декодування.
+# Результати складаються в чергу, яку головний потік (цикл Tk через after()) розбирає poll();
+# колбеки викликаються лише в потоці, що викликав poll(), тому в них можна чіпати віджети.
+#
+# Задачі мають ключ: нова задача з тим самим ключем скасовує попередню (її результат відкидається),
+# а повтор ідентичної задачі, поки перша ще не завершилась, просто до неї приєднується.
+# Записи в БД не варто скасовувати — вони могли вже виконатись; їм потрібен ключ із самих аргументів.
+# Модуль не імпортує tkinter.
+
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .decoder import EAN13ManualDecoder
+
+log = logging.getLogger(__name__)
+
+_decoder = None
+
+
+def _init_worker():
+    global _decoder
+    _decoder = EAN13ManualDecoder()
+
+
+def decode_path(path):
+    # Виконується у воркері пулу процесів; TieredResult — namedtuple, тож пікелюється
+    global _decoder
+    if _decoder is None:
+        _decoder = EAN13ManualDecoder()
+    return _decoder.decode_tiered_file(path)
+
+
+def decode_paths(paths):
+    # Кілька файлів однією задачею: [(шлях, код або None, причина невдачі), ...]
+    # Завеликий для PIL файл — теж лише невдача цього шляху, а не всієї задачі
+    from PIL import Image
+
+    results = []
+    for path in paths:
+        try:
+            result = decode_path(path)
+        except (ValueError, OSError, Image.DecompressionBombError) as e:
+            results.append((path, None, str(e)))
+            continue
+        reason = result.attempts[-1].error if result.code is None and result.attempts else ""
+        results.append((path, result.code, reason))
+    return results
+
+
+def _noop():
+    return None
+
+
+class Task:
+    def __init__(self, key, args, callback, errback):
+        self.key = key
+        self.args = args
+        self.callback = callback
+        self.errback = errback
+        self.future = None
+        self.cancelled = False
+
+
+class TaskRunner:
+    def __init__(self, io_workers=4, decode_workers=2, errback=None):
+        self.errback = errback
+        self._results = queue.SimpleQueue()
+        self._tasks = {}  # ключ -> поточна задача
+        self._lock = threading.Lock()
+        self._io = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="io")
+        # Процеси лише через fork: при spawn дочірній процес заново виконує головний скрипт
+        # (для lab4 — відкриває ще одне вікно). Де fork немає, декодування йде в потоках.
+        # Усі fork-воркери стартують на першій задачі, тож пул прогрівається одразу,
+        # поки в процесі ще немає інших потоків.
+        if decode_workers and "fork" in multiprocessing.get_all_start_methods():
+            self._decode = ProcessPoolExecutor(max_workers=decode_workers, initializer=_init_worker,
+                                               mp_context=multiprocessing.get_context("fork"))
+            self._decode.submit(_noop).result()
+        else:
+            self._decode = self._io
+
+    def submit_io(self, key, fn, *args, callback=None, errback=None):
+        return self._submit(self._io, key, fn, args, callback, errback)
+
+    def submit_decode(self, key, fn, *args, callback=None, errback=None):
+        return self._submit(self._decode, key, fn, args, callback, errback)
+
+    def _submit(self, executor, key, fn, args, callback, errback):
+        with self._lock:
+            current = self._tasks.get(key)
+            if current is not None and not current.cancelled and current.args == (fn, args):
+                return current
+            if current is not None:
+                self._cancel(current)
+            task = Task(key, (fn, args), callback, errback)
+            self._tasks[key] = task
+            task.future = executor.submit(fn, *args)
+        task.future.add_done_callback(lambda future: self._results.put(task))
+        return task
+
+    def _cancel(self, task):
+        task.cancelled = True
+        task.future.cancel()
+        if self._tasks.get(task.key) is task:
+            del self._tasks[task.key]
+
+    def cancel(self, key):
+        # Задача, що вже виконується, не переривається, але її результат буде відкинуто
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is not None:
+                self._cancel(task)
+
+    def pending(self, key):
+        with self._lock:
+            return key in self._tasks
+
+    def poll(self, limit=100):
+        # Розбирає до limit готових результатів; повертає кількість оброблених.
+        # Виняток у колбеку лише логується, щоб не зупинити обробку наступних результатів
+        handled = 0
+        while handled < limit:
+            try:
+                task = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                if task.cancelled or task.future.cancelled():
+                    continue
+                if self._tasks.get(task.key) is task:
+                    del self._tasks[task.key]
+            error = task.future.exception()
+            try:
+                if error is None:
+                    if task.callback is not None:
+                        task.callback(task.future.result())
+                else:
+                    errback = task.errback or self.errback
+                    if errback is None:
+                        log.error("Задача %r завершилась помилкою", task.key, exc_info=error)
+                    else:
+                        errback(error)
+            except Exception:
+                log.exception("Помилка в колбеку задачі %r", task.key)
+            handled += 1
+        return handled
+
+    def shutdown(self):
+        with self._lock:
+            for task in list(self._tasks.values()):
+                self._cancel(task)
+        self._io.shutdown(wait=False, cancel_futures=True)
+        if self._decode is not self._io:
+            self._decode.shutdown(wait=False, cancel_futures=True)
@@ -1,7 +1,12 @@
+import os
+import shutil
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
-from PIL import Image, ImageTk, ImageDraw, ImageFont
-import psycopg2
+from PIL import Image, ImageTk
+
+from ean13.cache import RenderCache
+from ean13.db import LookupCache, ProductDB, ProductListener, ProductPager
+from ean13.workers import TaskRunner, decode_paths
 
 
 
@@ -17,186 +22,29 @@ DB_CONFIG = {
 }
 
 
-def db_connect():
-    return psycopg2.connect(**DB_CONFIG)
-
-
-def db_add_product(name, code):
-    conn = db_connect()
-    cur = conn.cursor()
-    try:
-        cur.execute("INSERT INTO products (name, ean_code) VALUES (%s, %s)", (name, code))
-        conn.commit()
-        return True
-    except psycopg2.IntegrityError:
-        conn.rollback()
-        messagebox.showerror("Дублікат", f"Товар з кодом {code} вже є в базі!")
-        return False
-    except Exception as e:
-        conn.rollback()
-        messagebox.showerror("Помилка БД", str(e))
-        return False
-    finally:
-        conn.close()
-
-
-def db_find_product(code):
-    conn = db_connect()
-    cur = conn.cursor()
-    result_text = ""
-    try:
-        cur.execute("SELECT id, name, created_at FROM products WHERE ean_code = %s", (code,))
-        row = cur.fetchone()
-        if row:
-            prod_id, name, created_at = row
-            date_str = created_at.strftime("%Y-%m-%d %H:%M")
-            result_text = f"ЗНАЙДЕНО В БД:\nID: {prod_id}\nНазва: {name}\nДата: {date_str}"
-        else:
-            result_text = f"Код {code} вірний,\nале в базі такого товару немає."
-    except Exception as e:
-        result_text = f"Помилка: {str(e)}"
-    finally:
-        conn.close()
-        return result_text
-
-
-def db_get_all_products():
-
-    conn = db_connect()
-    cur = conn.cursor()
-    rows = []
-    try:
-
-        cur.execute("SELECT id, name, ean_code, created_at FROM products ORDER BY id DESC")
-        rows = cur.fetchall()
-    except Exception as e:
-        messagebox.showerror("Помилка завантаження", str(e))
-    finally:
-        conn.close()
-        return rows
-
-
-
-class EAN13ManualGenerator:
-    def __init__(self):
-        self.L_CODES = ["0001101", "0011001", "0010011", "0111101", "0100011", "0110001", "0101111", "0111011",
-                        "0110111", "0001011"]
-        self.G_CODES = ["0100111", "0110011", "0011011", "0100001", "0011101", "0111001", "0000101", "0010001",
-                        "0001001", "0010111"]
-        self.R_CODES = ["1110010", "1100110", "1101100", "1000010", "1011100", "1001110", "1010000", "1000100",
-                        "1001000", "1110100"]
-        self.PARITY_PATTERNS = ["LLLLLL", "LLGLGG", "LLGGLG", "LLGGGL", "LGLLGG", "LGGLLG", "LGGGLL", "LGLGLG",
-                                "LGLGGL", "LGGLGL"]
-
-    def calculate_check_digit(self, code_12):
-        sum_odd = sum(int(code_12[i]) for i in range(0, 12, 2))
-        sum_even = sum(int(code_12[i]) for i in range(1, 12, 2))
-        total = sum_odd + (sum_even * 3)
-        rem = total % 10
-        return 0 if rem == 0 else 10 - rem
-
-    def generate_image(self, code_input):
-        if len(code_input) != 12 or not code_input.isdigit():
-            raise ValueError("Треба 12 цифр")
-        check = self.calculate_check_digit(code_input)
-        full = code_input + str(check)
-
-        first = int(full[0])
-        left = full[1:7]
-        right = full[7:13]
-        pat = self.PARITY_PATTERNS[first]
-        binary = "101"
-        for i, d in enumerate(left):
-            binary += self.L_CODES[int(d)] if pat[i] == 'L' else self.G_CODES[int(d)]
-        binary += "01010"
-        for d in right:
-            binary += self.R_CODES[int(d)]
-        binary += "101"
-
-        module_w = 3
-        h = 100
-        quiet = 30
-        img_w = (len(binary) * module_w) + (2 * quiet)
-        img = Image.new('RGB', (img_w, h + 50), 'white')
-        draw = ImageDraw.Draw(img)
-
-        try:
-            font = ImageFont.truetype("arial.ttf", 22)
-        except:
-            font = ImageFont.load_default()
-
-        x = quiet
-        for bit in binary:
-            if bit == '1': draw.rectangle([x, 10, x + module_w - 1, h], fill='black')
-            x += module_w
-
-        draw.text((quiet - 20, h + 10), full[0], fill='black', font=font)
-        draw.text((quiet + (3 * module_w) + 10, h + 10), full[1:7], fill='black', font=font)
-        draw.text((quiet + (50 * module_w) + 10, h + 10), full[7:], fill='black', font=font)
-        return img, full
-
-
-class EAN13ManualDecoder:
-    def __init__(self):
-        gen = EAN13ManualGenerator()
-        self.decode_L = {code: str(i) for i, code in enumerate(gen.L_CODES)}
-        self.decode_G = {code: str(i) for i, code in enumerate(gen.G_CODES)}
-        self.decode_R = {code: str(i) for i, code in enumerate(gen.R_CODES)}
-        self.decode_parity = {pattern: str(i) for i, pattern in enumerate(gen.PARITY_PATTERNS)}
-
-    def decode_image_file(self, filepath):
-        img = Image.open(filepath).convert('L')
-        width, height = img.size
-        pixels = img.load()
-        mid_y = height // 2
-
-
-        raw_scan = [1 if pixels[x, mid_y] < 128 else 0 for x in range(width)]
-
-        try:
-            start_idx = raw_scan.index(1)
-            end_idx = len(raw_scan) - 1 - raw_scan[::-1].index(1)
-        except ValueError:
-            raise ValueError("Штрих-код не знайдено")
-
-        barcode_width = end_idx - start_idx + 1
-        module_size = barcode_width / 95.0
-
-        binary_string = ""
-        for i in range(95):
-            sample_x = start_idx + (i * module_size) + (module_size / 2)
-            val = pixels[int(sample_x), mid_y]
-            binary_string += '1' if val < 128 else '0'
+RENDER_CACHE_DIR = ".barcode_cache"
+RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
-        if binary_string[:3] != "101" or binary_string[-3:] != "101":
-            raise ValueError("Нечіткі маркери")
+render_cache = RenderCache(RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES)
 
-        left_bin = binary_string[3:45]
-        right_bin = binary_string[50:92]
 
-        left_digits = ""
-        parity_pat = ""
+# psycopg2 закриває повернені зʼєднання понад minconn, тож тримаємо в пулі всі
+DB_POOL_MAX = 5
+DB_POOL_MIN = DB_POOL_MAX
 
-        for i in range(0, 42, 7):
-            chunk = left_bin[i:i + 7]
-            if chunk in self.decode_L:
-                left_digits += self.decode_L[chunk]
-                parity_pat += "L"
-            elif chunk in self.decode_G:
-                left_digits += self.decode_G[chunk]
-                parity_pat += "G"
-            else:
+products_db = ProductDB(DB_CONFIG, DB_POOL_MIN, DB_POOL_MAX, cache=LookupCache())
 
-                return "Помилка читання (шум)"
+# БД і файли — у потоках, декодування — у процесах; результати розбирає pump_results() через after()
+RESULTS_POLL_MS = 50
+runner = TaskRunner(io_workers=DB_POOL_MAX, decode_workers=2)
 
-        right_digits = ""
-        for i in range(0, 42, 7):
-            chunk = right_bin[i:i + 7]
-            if chunk in self.decode_R:
-                right_digits += self.decode_R[chunk]
 
-        first_digit = self.decode_parity.get(parity_pat, "?")
-        return first_digit + left_digits + right_digits
+def describe_product(code, row):
+    if row:
+        prod_id, name, created_at = row
+        date_str = created_at.strftime("%Y-%m-%d %H:%M") if created_at else "—"
+        return f"ЗНАЙДЕНО В БД:\nID: {prod_id}\nНазва: {name}\nДата: {date_str}"
+    return f"Код {code} вірний,\nале в базі такого товару немає."
 
 
 root = tk.Tk()
@@ -229,32 +77,43 @@ lbl_preview = tk.Label(tab1)
 lbl_preview.pack(pady=10)
 
 
-def click_gen():
-    name = e_name.get()
-    raw_code = e_code.get()
-    if not name or len(raw_code) != 12:
-        messagebox.showerror("Помилка", "Перевірте назву та 12 цифр коду")
-        return
-    try:
-        gen = EAN13ManualGenerator()
-        img, full_code = gen.generate_image(raw_code)
+def gen_task(name, raw_code):
+    # Фоновий потік: рендер (з кешу), копія файлу і вставка в БД; віджетів не чіпає
+    cached_path, full_code = render_cache.render(raw_code, mode='1', compression="max")
+    with Image.open(cached_path) as img:
+        img.load()
 
+    filename = f"barcode_{full_code}.png"
+    if not os.path.exists(filename):
+        shutil.copyfile(cached_path, filename)
 
-        img_tk = ImageTk.PhotoImage(img)
-        lbl_preview.config(image=img_tk)
-        lbl_preview.image = img_tk
+    return img, full_code, products_db.add_product(name, full_code)
 
 
-        filename = f"barcode_{full_code}.png"
-        img.save(filename)
+def on_gen_done(name, result):
+    img, full_code, added = result
+    img_tk = ImageTk.PhotoImage(img)
+    lbl_preview.config(image=img_tk)
+    lbl_preview.image = img_tk
 
+    if added:
+        messagebox.showinfo("Успіх", f"Товар '{name}' збережено!\nКод: {full_code}")
+        refresh_table()  # Дописати новий рядок у таблицю на 3-й вкладці
+    else:
+        messagebox.showerror("Дублікат", f"Товар з кодом {full_code} вже є в базі!")
 
-        if db_add_product(name, full_code):
-            messagebox.showinfo("Успіх", f"Товар '{name}' збережено!\nКод: {full_code}")
-            load_table_data()  # Оновити таблицю на 3-й вкладці
 
-    except Exception as e:
-        messagebox.showerror("Помилка", str(e))
+def click_gen():
+    name = e_name.get()
+    raw_code = e_code.get()
+    if not name or len(raw_code) != 12:
+        messagebox.showerror("Помилка", "Перевірте назву та 12 цифр коду")
+        return
+    # Ключ — самі дані: повторне натискання з тими ж даними приєднується до задачі в роботі,
+    # а інші дані не скасовують попередню вставку, що могла вже відбутися
+    runner.submit_io(("gen", name, raw_code), gen_task, name, raw_code,
+                     callback=lambda result: on_gen_done(name, result),
+                     errback=lambda e: messagebox.showerror("Помилка", str(e)))
 
 
 tk.Button(f_gen, text="Згенерувати та Зберегти в БД", command=click_gen, bg="#dcedc8").pack(fill="x", pady=10)
@@ -267,26 +126,58 @@ lbl_scan_res = tk.Label(tab2, text="Результат з'явиться тут"
 lbl_scan_res.pack(pady=20)
 
 
-def click_scan():
-    path = filedialog.askopenfilename()
-    if not path: return
-    try:
-        decoder = EAN13ManualDecoder()
-        decoded_code = decoder.decode_image_file(path)
+def show_scan_error(e):
+    lbl_scan_res.config(text=str(e), fg="red")
 
 
-        if "?" in decoded_code or len(decoded_code) != 13:
-            lbl_scan_res.config(text=f"Не вдалося розпізнати: {decoded_code}", fg="red")
+SCAN_SUMMARY_LINES = 15
+
+
+def show_lookup(results, lookup):
+    found, _ = lookup
+    if len(results) == 1:
+        code = results[0][1]
+        lbl_scan_res.config(text=describe_product(code, found.get(code)), fg="blue")
+        return
+    lines = []
+    for path, code, reason in results:
+        if code is None:
+            status = "не розпізнано"
+        elif code in found:
+            status = f"{code} — {found[code][1]}"
         else:
+            status = f"{code} — немає в БД"
+        lines.append(f"{os.path.basename(path)}: {status}")
+    matched = sum(1 for _, code, _ in results if code in found)
+    text = f"Знайдено в БД: {matched} з {len(results)}\n" + "\n".join(lines[:SCAN_SUMMARY_LINES])
+    if len(lines) > SCAN_SUMMARY_LINES:
+        text += f"\n... ще {len(lines) - SCAN_SUMMARY_LINES}"
+    lbl_scan_res.config(text=text, fg="blue")
+
+
+def on_decoded(results):
+    codes = [code for _, code, _ in results if code is not None]
+    if not codes:
+        reason = results[-1][2] if len(results) == 1 else "жодного коду"
+        lbl_scan_res.config(text=f"Не вдалося розпізнати: {reason}", fg="red")
+        return
+    # Усі розпізнані коди звіряються з БД одним запитом
+    lbl_scan_res.config(text=f"Розпізнано {len(codes)}, пошук у БД...", fg="black")
+    runner.submit_io("scan_db", products_db.find_products, codes,
+                     callback=lambda lookup: show_lookup(results, lookup),
+                     errback=lambda e: lbl_scan_res.config(text=f"Помилка: {str(e)}", fg="red"))
 
-            db_info = db_find_product(decoded_code)
-            lbl_scan_res.config(text=db_info, fg="blue")
 
-    except Exception as e:
-        lbl_scan_res.config(text=str(e), fg="red")
+def click_scan():
+    paths = filedialog.askopenfilenames()
+    if not paths: return
+    # Новий вибір скасовує розпізнавання й пошук для попереднього
+    runner.cancel("scan_db")
+    lbl_scan_res.config(text="Розпізнавання...", fg="black")
+    runner.submit_decode("scan", decode_paths, list(paths), callback=on_decoded, errback=show_scan_error)
 
 
-tk.Button(f_scan, text="Завантажити файл штрих-коду", command=click_scan, bg="#bbdefb").pack(fill="x", pady=10)
+tk.Button(f_scan, text="Завантажити файли штрих-кодів", command=click_scan, bg="#bbdefb").pack(fill="x", pady=10)
 
 
 columns = ("id", "name", "code", "date")
@@ -304,35 +195,148 @@ tree.column("name", width=200)
 tree.column("code", width=120)
 tree.column("date", width=150)
 
+tree_scroll = ttk.Scrollbar(tab3, orient="vertical", command=tree.yview)
+tree_scroll.pack(side="right", fill="y", pady=10)
 tree.pack(fill="both", expand=True, padx=10, pady=10)
 
 
-def load_table_data():
+TABLE_PAGE_SIZE = 200
+PREFETCH_AT = 0.9  # частка прокрутки, після якої догружається наступна сторінка
+
+table_pager = ProductPager(products_db, TABLE_PAGE_SIZE)
+table_loading = False
+table_failed = False  # остання сторінка не завантажилась — таблицю треба перезавантажити
+
+
+def format_row(row):
+    formatted_row = list(row)
+    if row[3]:  # Якщо дата є
+        formatted_row[3] = row[3].strftime("%Y-%m-%d %H:%M")
+    return formatted_row
+
+
+def show_load_error(e, quiet=False):
+    # Пейджер позначається вичерпаним, щоб прокрутка не повторювала запит до недоступної БД
+    global table_loading, table_failed
+    table_loading = False
+    table_failed = True
+    table_pager.exhausted = True
+    if not quiet:
+        messagebox.showerror("Помилка завантаження", str(e))
+
+
+def append_page(rows):
+    # Таблиця тримає лише прокручені сторінки; нова сторінка форматується,
+    # коли користувач до неї дійшов
+    global table_loading
+    for row in rows:
+        if not tree.exists(str(row[0])):
+            tree.insert("", "end", iid=str(row[0]), values=format_row(row))
+    table_loading = False
+
+
+def load_next_page(quiet=False):
+    global table_loading
+    if table_pager.exhausted:
+        table_loading = False
+        return
+    table_loading = True
+    runner.submit_io("page", table_pager.next_page, callback=append_page,
+                     errback=lambda e: show_load_error(e, quiet))
+
+
+def on_tree_scroll(first, last):
+    tree_scroll.set(first, last)
+    if float(last) >= PREFETCH_AT and not table_loading and not table_pager.exhausted:
+        load_next_page()
+
 
-    for row in tree.get_children():
-        tree.delete(row)
+tree.configure(yscrollcommand=on_tree_scroll)
 
 
-    rows = db_get_all_products()
+def load_table_data(quiet=False):
+    # Новий пейджер, а не reset(): сторінка старого, що ще в роботі, буде відкинута
+    global table_pager, table_failed
+    runner.cancel("refresh")
+    tree.delete(*tree.get_children())
+    table_pager = ProductPager(products_db, TABLE_PAGE_SIZE)
+    table_failed = False
+    load_next_page(quiet)
 
 
+def patch_rows(rows):
     for row in rows:
+        iid = str(row[0])
+        if tree.exists(iid):
+            tree.item(iid, values=format_row(row))
+        else:
+            tree.insert("", 0, iid=iid, values=format_row(row))
+
+
+def refresh_table(quiet=False):
+    # Лише рядки, додані після найновішого показаного; решта таблиці не чіпається.
+    # quiet — фонове оновлення: помилки БД не показуються модальним вікном
+    if table_failed or (table_pager.newest_id is None and not table_pager.exhausted):
+        if not runner.pending("page"):
+            load_table_data(quiet)
+        return
+    if quiet:
+        errback = lambda e: None
+    else:
+        errback = lambda e: messagebox.showerror("Помилка завантаження", str(e))
+    runner.submit_io("refresh", table_pager.new_rows, callback=patch_rows, errback=errback)
+
 
-        formatted_row = list(row)
-        if row[3]:  # Якщо дата є
-            formatted_row[3] = row[3].strftime("%Y-%m-%d %H:%M")
+CHANGE_POLL_MS = 1000  # перевірка сокета LISTEN — без запитів до БД
+FALLBACK_POLL_MS = 10000  # без LISTEN — дешевий запит id > newest_id
 
-        tree.insert("", "end", values=formatted_row)
+product_listener = None
 
 
+def set_listener(listener):
+    global product_listener
+    product_listener = listener
+
+
+def connect_listener():
+    # psycopg2.connect блокує — тому у фоновому потоці; невдача означає опитування раз на 10 с
+    if not runner.pending("listen"):
+        runner.submit_io("listen", ProductListener, DB_CONFIG, callback=set_listener, errback=lambda e: None)
+
+
+def watch_changes():
+    global product_listener
+    changed = True
+    if product_listener is not None:
+        try:
+            changed = product_listener.poll()
+        except Exception:
+            product_listener = None
+    if product_listener is None:
+        connect_listener()
+    if changed:
+        refresh_table(quiet=True)
+    root.after(CHANGE_POLL_MS if product_listener is not None else FALLBACK_POLL_MS, watch_changes)
+
+
+def pump_results():
+    try:
+        runner.poll()
+    finally:
+        root.after(RESULTS_POLL_MS, pump_results)
+
 
-btn_refresh = tk.Button(tab3, text="Оновити таблицю", command=load_table_data)
+btn_refresh = tk.Button(tab3, text="Оновити таблицю", command=refresh_table)
 btn_refresh.pack(fill="x", padx=10, pady=5)
 
 
-try:
-    load_table_data()
-except:
-    pass
+load_table_data()
+connect_listener()
 
-root.mainloop()
\ No newline at end of file
+root.after(RESULTS_POLL_MS, pump_results)
+root.after(CHANGE_POLL_MS, watch_changes)
+root.mainloop()
+runner.shutdown()
+if product_listener is not None:
+    product_listener.close()
+products_db.close()
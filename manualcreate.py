@@ -1,88 +1,12 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 import tkinter as tk
 from tkinter import messagebox
 
+from ean13 import EAN13ManualGenerator as BaseGenerator
+from ean13.render import digit_atlas, draw_digits, load_font, rasterize
 
-class EAN13ManualGenerator:
-    def __init__(self):
-
-        self.L_CODES = [
-            "0001101", "0011001", "0010011", "0111101", "0100011",
-            "0110001", "0101111", "0111011", "0110111", "0001011"
-        ]
-        self.G_CODES = [
-            "0100111", "0110011", "0011011", "0100001", "0011101",
-            "0111001", "0000101", "0010001", "0001001", "0010111"
-        ]
-        self.R_CODES = [
-            "1110010", "1100110", "1101100", "1000010", "1011100",
-            "1001110", "1010000", "1000100", "1001000", "1110100"
-        ]
-
-
-        self.PARITY_PATTERNS = [
-            "LLLLLL", "LLGLGG", "LLGGLG", "LLGGGL", "LGLLGG",
-            "LGGLLG", "LGGGLL", "LGLGLG", "LGLGGL", "LGGLGL"
-        ]
-
-    def calculate_check_digit(self, code_12):
-
-        sum_odd = 0
-        sum_even = 0
-
-
-        for i, char in enumerate(code_12):
-            digit = int(char)
-            if (i + 1) % 2 != 0:
-                sum_odd += digit
-            else:
-                sum_even += digit
-
-        total = sum_odd + (sum_even * 3)
-        remainder = total % 10
-        if remainder == 0:
-            return 0
-        return 10 - remainder
-
-    def encode(self, code_input):
-
-        if len(code_input) != 12 or not code_input.isdigit():
-            raise ValueError("Має бути 12 цифр")
-
-
-        check_digit = self.calculate_check_digit(code_input)
-        full_code = code_input + str(check_digit)
-
-
-        first_digit = int(full_code[0])
-        left_side_digits = full_code[1:7]
-        right_side_digits = full_code[7:13]
-
-        pattern = self.PARITY_PATTERNS[first_digit]
-
-
-        binary_string = "101"
-
-
-        for i, digit_char in enumerate(left_side_digits):
-            digit = int(digit_char)
-            encoding_type = pattern[i]
-            if encoding_type == 'L':
-                binary_string += self.L_CODES[digit]
-            else:
-                binary_string += self.G_CODES[digit]
-
-        binary_string += "01010"
-
-
-        for digit_char in right_side_digits:
-            digit = int(digit_char)
-            binary_string += self.R_CODES[digit]
-
-        binary_string += "101"
-
-        return full_code, binary_string
 
+class EAN13ManualGenerator(BaseGenerator):
     def draw_barcode(self, code_input, filename="manual_barcode.png"):
         try:
             full_code, binary_string = self.encode(code_input)
@@ -94,35 +18,24 @@ class EAN13ManualGenerator:
         module_width = 3
         height = 150
         quiet_zone = 30
+        font_size = 40
 
-        total_width = (len(binary_string) * module_width) + (2 * quiet_zone)
-
-
-        img = Image.new('RGB', (total_width, height + 50), 'white')
-        draw = ImageDraw.Draw(img)
-
-
-        x = quiet_zone
-        for bit in binary_string:
-            if bit == '1':
-
-                draw.rectangle([x, 10, x + module_width - 1, height], fill='black')
-            x += module_width
-
-
-        try:
-            font = ImageFont.truetype("arial.ttf", 40)
-        except:
-            font = ImageFont.load_default()
 
+        canvas = rasterize(binary_string, module_width, height, quiet_zone, text_area=50)
+        atlas = digit_atlas(font_size)
 
-        draw.text((5, height + 5), full_code[0], fill='black', font=font)
 
+        draw_digits(canvas, (5, height + 5), full_code[0], atlas)
 
-        text_part = full_code[1:]
 
-        draw.text((quiet_zone + 20, height + 5), f"{text_part[:6]}   {text_part[6:]}", fill='black', font=font)
+        # "ліві 6   праві 6": три пробіли між групами — зсув на їх ширину
+        left, right = full_code[1:7], full_code[7:]
+        x = quiet_zone + 20
+        draw_digits(canvas, (x, height + 5), left, atlas)
+        x += sum(atlas[d][1] for d in left) + load_font(font_size).getlength("   ")
+        draw_digits(canvas, (x, height + 5), right, atlas)
 
+        img = Image.fromarray(canvas)
         img.save(filename)
         img.show()
         return full_code